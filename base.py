@@ -1,18 +1,191 @@
-
+from array import array
 import uuid as u
+import base64
+import hashlib
+import json
 import math
 import os.path
+import struct
+import sys
+import weakref
 
 import sublime
 
 
+if '.' in __name__:
+    from .stats import TIMER, record, timed
+    from .touch import link_view, unlink_view
+else:
+    from stats import TIMER, record, timed
+    from touch import link_view, unlink_view
+
+
+COLOR_SCHEMES = {}
+TEMPLATES = {}
+TEMPLATE_LIMIT = 64
+FRAME_TIME = 1 / 60.0
+LOG_MAGIC = b'GLOG'
+LOG_VERSION = 1
+LOG_HEADER = struct.Struct('<4sBBB')
+LOG_SETTING = 'games_log'
+
+
+def parse_log(data):
+    if len(data) < LOG_HEADER.size:
+        raise ValueError('Not a game log')
+    magic, version, game_id, count = LOG_HEADER.unpack_from(data)
+    if not magic == LOG_MAGIC or not version == LOG_VERSION:
+        raise ValueError('Not a game log')
+    offset = LOG_HEADER.size
+    params = struct.unpack_from('<%dI' % count, data, offset)
+    offset += 4 * count
+    width = struct.unpack_from('<B', data, offset)[0]
+    moves = array('B' if width == 1 else 'H')
+    getattr(moves, 'frombytes', getattr(moves, 'fromstring', None))(data[offset + 1:])
+    if sys.byteorder == 'big' and width > 1:
+        moves.byteswap()
+    return game_id, params, moves
+
+
+def approximate_size(value, seen=None, depth=4):
+    seen = set() if seen is None else seen
+    if id(value) in seen or isinstance(value, (sublime.View, Template)):
+        return 0
+    seen.add(id(value))
+    size = sys.getsizeof(value)
+    if depth <= 0:
+        return size
+    if isinstance(value, dict):
+        for key, item in value.items():
+            size += approximate_size(key, seen, depth - 1)
+            size += approximate_size(item, seen, depth - 1)
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        for item in value:
+            size += approximate_size(item, seen, depth - 1)
+    elif hasattr(value, '__dict__') and not callable(value):
+        size += approximate_size(value.__dict__, seen, depth - 1)
+    return size
+
+
+class GridLayout(object):
+    def __init__(
+        self, rows, cols, cell_width, origin_row=0, origin_col=0, row_height=1, lines=(0,)
+    ):
+        self.rows = rows
+        self.cols = cols
+        self.cell_width = cell_width
+        self.origin_row = origin_row
+        self.origin_col = origin_col
+        self.row_height = row_height
+        self.lines = lines
+
+    def cell(self, view, point):
+        line, char = view.rowcol(point)
+        if line < self.origin_row or char < self.origin_col:
+            return None
+        row, line_offset = divmod(line - self.origin_row, self.row_height)
+        col = (char - self.origin_col) // self.cell_width
+        if row >= self.rows or col >= self.cols or line_offset not in self.lines:
+            return None
+        return row, col
+
+    def index(self, view, point):
+        cell = self.cell(view, point)
+        if cell is not None:
+            return cell[0] * self.cols + cell[1]
+
+
+class GameLifecycle(object):
+    def __init__(self):
+        self.games = {}
+        self.cleanups = []
+
+    def get(self, view):
+        return self.games.get(view.id())
+
+    def add(self, view, game):
+        previous = self.games.get(view.id())
+        if previous is not None and previous is not game:
+            self.release(view.id())
+        self.games[view.id()] = game
+        return game
+
+    def release(self, view_id):
+        game = self.games.pop(view_id, None)
+        if game is not None and not game.detach(view_id):
+            game.close()
+
+    def close(self, view_id):
+        self.release(view_id)
+        for cleanup in self.cleanups:
+            cleanup(view_id)
+
+    def prune(self):
+        view_ids = set(x.id() for window in sublime.windows() for x in window.views())
+        for view_id in [x for x in self.games if x not in view_ids]:
+            self.close(view_id)
+
+
+LIFECYCLE = GameLifecycle()
+
+
+class Template(object):
+    def __init__(self):
+        self.parts = []
+        self.pending = []
+        self.slots = {}
+        self.regions = {}
+        self.size = 0
+
+    def add(self, text, name=None):
+        begin = self.size
+        self.pending.append(text)
+        self.size += len(text)
+        if name is not None:
+            self.regions[name] = sublime.Region(begin, self.size)
+        return begin
+
+    def add_slot(self, name, width):
+        self.flush()
+        self.slots[name] = (len(self.parts), width)
+        self.parts.append(' ' * width)
+        begin = self.size
+        self.size += width
+        self.regions[name] = sublime.Region(begin, self.size)
+        return begin
+
+    def flush(self):
+        if self.pending:
+            self.parts.append(''.join(self.pending))
+            self.pending = []
+
+    def render(self, values):
+        self.flush()
+        parts = list(self.parts)
+        for name, slot in self.slots.items():
+            index, width = slot
+            parts[index] = values[name][:width].ljust(width)
+        return ''.join(parts)
+
+
 class Game(object):
+    log_id = 0
+
     def __init__(self, view=None, settings=None, configure=True):
         if view is None:
             window = sublime.active_window()
             view = window.new_file()
         self.view = view
+        self.mirrors = []
         self.colors = []
+        self.diff_render = True
+        self.rendered = None
+        self.region_layers = {}
+        self.dirty_spans = []
+        self.frame_pending = False
+        self.draw_dirty = False
+        self.frame_started = 0.0
+        self.frame_cost = 0.0
         self.settings = {
             'font_face': 'Courier New',
             'font_size': 20,
@@ -34,36 +207,76 @@ class Game(object):
             'name': 'Game',
             'scratch': True,
             'read_only': True,
+            'games_view': True,
         }
         if settings is not None:
             self.settings.update(settings)
         if configure:
             self.configure_view()
 
-    def configure_view(self, **kwargs):
+    def views(self):
+        if self.view is None:
+            return []
+        return [self.view] + self.mirrors
+
+    def configure_view(self, view=None, **kwargs):
+        view = self.view if view is None else view
         for name, value in self.settings.items():
             if name not in kwargs:
                 kwargs[name] = value
         self.clear_selection()
         if 'scratch' in kwargs:
-            self.view.set_scratch(kwargs.pop('scratch'))
+            view.set_scratch(kwargs.pop('scratch'))
         if 'read_only' in kwargs:
-            self.view.set_read_only(kwargs.pop('read_only'))
+            view.set_read_only(kwargs.pop('read_only'))
         if 'name' in kwargs:
-            self.view.set_name(kwargs.pop('name'))
-        settings = self.view.settings()
+            view.set_name(kwargs.pop('name'))
+        settings = view.settings()
         for name, value in kwargs.items():
             settings.set(name, value)
 
+    def set_view_setting(self, name, value):
+        for view in self.views():
+            view.settings().set(name, value)
+
+    def attach(self, view):
+        self.mirrors.append(view)
+        self.configure_view(view)
+        view.settings().set('color_scheme', self.view.settings().get('color_scheme'))
+        view.run_command('utils_edit_view', {
+            'data': self.rendered or '', 'start': 0, 'end': view.size()
+        })
+        for key, layer in self.region_layers.items():
+            if layer[1]:
+                view.add_regions(key, layer[1], layer[2], '', 0)
+        link_view(view, self.view)
+
+    def detach(self, view_id):
+        mirrors = [x for x in self.mirrors if not x.id() == view_id]
+        if len(mirrors) < len(self.mirrors):
+            self.mirrors = mirrors
+            unlink_view(view_id)
+            return True
+        if self.view is None or not self.view.id() == view_id or not self.mirrors:
+            return False
+        self.view = self.mirrors.pop(0)
+        unlink_view(self.view.id())
+        for mirror in self.mirrors:
+            link_view(mirror, self.view)
+        self.draw_board()
+        self.persist_log()
+        return True
+
     def zoom(self, amount, clear=False):
-        self.view.settings().set('font_size', self.view.settings().get('font_size') + amount)
+        self.set_view_setting('font_size', self.view.settings().get('font_size') + amount)
         if clear:
             self.clear_selection()
 
     def clear_selection(self):
-        sel = self.view.sel()
-        sel.clear()
-        sel.add(sublime.Region(0, 0))
+        for view in self.views():
+            sel = view.sel()
+            sel.clear()
+            sel.add(sublime.Region(0, 0))
 
     def generate_colors_xml(self, colors=None):
         if colors is None:
@@ -114,7 +327,7 @@ class Game(object):
             foreground=foreground, caret=caret, fontStyle=fontStyle
         )
 
-    def set_color_scheme(
+    def color_scheme_path(
         self,
         xml=None,
         filename=None,
@@ -126,14 +339,234 @@ class Game(object):
         uuid=None
     ):
         if xml is None:
-            xml = self.generate_theme_xml(colors, background, foreground, caret, fontStyle, uuid)
-        if filename is None:
-            filename = '%s.tmTheme' % (self.__class__.__name__)
-        packages_path = sublime.packages_path()
-        with open(os.path.join(packages_path, 'User', filename), 'w') as theme_file:
-            theme_file.write(xml)
-        settings = self.view.settings()
-        settings.set('color_scheme', 'Packages/User/%s' % filename)
+            key = json.dumps(
+                [
+                    self.colors if colors is None else colors, background, foreground, caret,
+                    fontStyle
+                ],
+                sort_keys=True
+            )
+        else:
+            key = xml
+        digest = hashlib.sha1(key.encode('utf-8')).hexdigest()
+        named = filename is not None
+        if not named:
+            filename = '%s-%s.tmTheme' % (self.__class__.__name__, digest[:12])
+        if not COLOR_SCHEMES.get(filename) == digest:
+            path = os.path.join(sublime.packages_path(), 'User', filename)
+            if named or not os.path.exists(path):
+                if xml is None:
+                    if uuid is None:
+                        uuid = u.UUID(digest[:32])
+                    xml = self.generate_theme_xml(
+                        colors, background, foreground, caret, fontStyle, uuid)
+                with open(path, 'w') as theme_file:
+                    theme_file.write(xml)
+            COLOR_SCHEMES[filename] = digest
+        return 'Packages/User/%s' % filename
+
+    @timed('set_color_scheme')
+    def set_color_scheme(
+        self,
+        xml=None,
+        filename=None,
+        colors=None,
+        background='#ffffff',
+        foreground='#000000',
+        caret='#ffffff',
+        fontStyle='bold',
+        uuid=None
+    ):
+        color_scheme = self.color_scheme_path(
+            xml, filename, colors, background, foreground, caret, fontStyle, uuid)
+        for view in self.views():
+            settings = view.settings()
+            if not settings.get('color_scheme') == color_scheme:
+                settings.set('color_scheme', color_scheme)
+
+    def render(self, data):
+        rendered = self.rendered
+        self.rendered = data
+        started = TIMER()
+        if not self.diff_render or rendered is None or not self.view.size() == len(rendered):
+            for view in self.views():
+                view.run_command('utils_edit_view', {'data': data, 'start': 0, 'end': view.size()})
+            self.region_layers = {}
+            self.dirty_spans = []
+            full = True
+        else:
+            edits = self.diff_text(rendered, data)
+            if edits:
+                for view in self.views():
+                    view.run_command('utils_edit_view', {'edits': edits})
+            self.dirty_spans.extend((x[0], x[0] + len(x[2])) for x in edits)
+            full = False
+        record(self.view, 'utils_edit_view', TIMER() - started)
+        return full
+
+    def diff_text(self, old, new):
+        old_lines = old.split('\n')
+        new_lines = new.split('\n')
+        if not len(old_lines) == len(new_lines):
+            return [self.diff_span(old, new, 0)]
+        edits = []
+        offset = 0
+        for old_line, new_line in zip(old_lines, new_lines):
+            if not old_line == new_line:
+                edits.append(self.diff_span(old_line, new_line, offset))
+            offset += len(old_line) + 1
+        return edits
+
+    def diff_span(self, old, new, offset):
+        limit = min(len(old), len(new))
+        start = 0
+        while start < limit and old[start] == new[start]:
+            start += 1
+        end = 0
+        while end < limit - start and old[-end - 1] == new[-end - 1]:
+            end += 1
+        return [offset + start, offset + len(old) - end, new[start:len(new) - end]]
+
+    def draw_regions(self, layers):
+        dirty = self.dirty_spans
+        self.dirty_spans = []
+        changed = 0
+        for key, regions in layers.items():
+            signature = tuple((x.begin(), x.end()) for x in regions)
+            if self.region_layers.get(key, (None,))[0] == signature and not [
+                x for x in signature for y in dirty if x[0] <= y[1] and y[0] <= x[1]
+            ]:
+                continue
+            self.draw_layer(key, regions, signature=signature)
+            changed += 1
+        record(self.view, 'region_layers.changed', changed)
+
+    def draw_layer(self, key, regions, scope=None, signature=None):
+        scope = key if scope is None else scope
+        if signature is None:
+            signature = tuple((x.begin(), x.end()) for x in regions)
+        for view in self.views():
+            if regions:
+                view.add_regions(key, regions, scope, '', 0)
+            else:
+                view.erase_regions(key)
+        self.region_layers[key] = (signature, regions, scope)
+
+    def request_draw(self):
+        self.draw_dirty = True
+        self.request_frame()
+
+    def request_frame(self):
+        if self.frame_pending:
+            return
+        self.frame_pending = True
+        delay = max(FRAME_TIME, self.frame_cost) - (TIMER() - self.frame_started)
+        sublime.set_timeout(self.weak_callback('flush_frame'), max(0, int(delay * 1000)))
+
+    def flush_frame(self):
+        self.frame_pending = False
+        started = TIMER()
+        if self.draw_dirty:
+            self.draw_dirty = False
+            self.draw_board()
+        if self.step_animation():
+            self.request_frame()
+        self.frame_started = started
+        self.frame_cost = TIMER() - started
+        record(self.view, 'frame', self.frame_cost)
+
+    def step_animation(self):
+        return False
+
+    def weak_callback(self, name, *args):
+        game = weakref.ref(self)
+
+        def callback():
+            instance = game()
+            if instance is not None and instance.view is not None:
+                getattr(instance, name)(*args)
+        return callback
+
+    def weak_handler(self, name, *args):
+        game = weakref.ref(self)
+
+        def handler(handler_id, view, region, point):
+            instance = game()
+            if instance is not None and instance.view is not None:
+                getattr(instance, name)(*args)
+        return handler
+
+    def weak_region_handler(self, name):
+        game = weakref.ref(self)
+
+        def handler(handler_id, view, region, point):
+            instance = game()
+            if instance is not None and instance.view is not None:
+                getattr(instance, name)(region, point)
+        return handler
+
+    def close(self):
+        for mirror in self.mirrors:
+            unlink_view(mirror.id())
+        self.view = None
+        self.mirrors = []
+
+    def memory_usage(self):
+        return approximate_size(self)
+
+    def is_computer_turn(self):
+        return False
+
+    def undo(self):
+        if self.undo_move() is None:
+            return False
+        while self.history and self.is_computer_turn():
+            self.undo_move()
+        self.history_changed()
+        return True
+
+    def redo(self):
+        if self.redo_move() is None:
+            return False
+        while self.redo_stack and self.is_computer_turn() and not self.game_over:
+            self.redo_move()
+        self.history_changed()
+        return True
+
+    def history_changed(self):
+        if not self.game_over:
+            self.set_color_scheme()
+        self.clear_selection()
+        self.request_draw()
+        self.persist_log()
+
+    def log_params(self):
+        return ()
+
+    def dump_log(self):
+        params = self.log_params()
+        moves = self.moves
+        if sys.byteorder == 'big' and moves.itemsize > 1:
+            moves = array(moves.typecode, moves)
+            moves.byteswap()
+        return b''.join([
+            LOG_HEADER.pack(LOG_MAGIC, LOG_VERSION, self.log_id, len(params)),
+            struct.pack('<%dI' % len(params), *params),
+            struct.pack('<B', moves.itemsize),
+            getattr(moves, 'tobytes', getattr(moves, 'tostring', None))()
+        ])
+
+    def persist_log(self):
+        self.view.settings().set(LOG_SETTING, base64.b64encode(self.dump_log()).decode('ascii'))
+
+    def template(self, *key):
+        key = (self.__class__.__name__,) + key
+        template = TEMPLATES.get(key)
+        if template is None:
+            if len(TEMPLATES) >= TEMPLATE_LIMIT:
+                TEMPLATES.clear()
+            template = TEMPLATES[key] = self.build_template(*key[1:])
+        return template
 
     def centered_text(self, text, width):
         left = ' ' * (int(math.floor((width - len(text)) / 2)))
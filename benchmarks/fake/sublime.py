@@ -0,0 +1,185 @@
+import itertools
+import os
+import tempfile
+
+
+PACKAGES = os.path.join(tempfile.gettempdir(), 'games-benchmarks')
+TIMEOUTS = []
+WINDOWS = []
+IDS = itertools.count(1)
+
+
+def version():
+    return '3000'
+
+
+def packages_path():
+    return PACKAGES
+
+
+def set_timeout(callback, delay=0):
+    TIMEOUTS.append(callback)
+
+
+def set_timeout_async(callback, delay=0):
+    TIMEOUTS.append(callback)
+
+
+def run_timeouts():
+    while TIMEOUTS:
+        TIMEOUTS.pop(0)()
+
+
+def active_window():
+    if not WINDOWS:
+        WINDOWS.append(Window())
+    return WINDOWS[-1]
+
+
+def windows():
+    return list(WINDOWS)
+
+
+def status_message(message):
+    pass
+
+
+def message_dialog(message):
+    pass
+
+
+def run_command(name, args=None):
+    pass
+
+
+class Region(object):
+    def __init__(self, a, b=None):
+        self.a = a
+        self.b = a if b is None else b
+
+    def begin(self):
+        return min(self.a, self.b)
+
+    def end(self):
+        return max(self.a, self.b)
+
+    def empty(self):
+        return self.a == self.b
+
+    def contains(self, point):
+        return self.begin() <= point <= self.end()
+
+
+class Settings(object):
+    def __init__(self):
+        self.values = {}
+
+    def get(self, name, default=None):
+        return self.values.get(name, default)
+
+    def set(self, name, value):
+        self.values[name] = value
+
+
+class Selection(list):
+    def clear(self):
+        del self[:]
+
+    def add(self, region):
+        self.append(region)
+
+
+class View(object):
+    def __init__(self, window=None):
+        self.view_id = next(IDS)
+        self.window_ref = window
+        self.text = ''
+        self.selection = Selection([Region(0, 0)])
+        self.view_settings = Settings()
+        self.view_settings.set('font_size', 20)
+        self.regions = {}
+        self.read_only = False
+
+    def id(self):
+        return self.view_id
+
+    def window(self):
+        return self.window_ref
+
+    def size(self):
+        return len(self.text)
+
+    def sel(self):
+        return self.selection
+
+    def settings(self):
+        return self.view_settings
+
+    def set_scratch(self, value):
+        pass
+
+    def set_read_only(self, value):
+        self.read_only = value
+
+    def is_read_only(self):
+        return self.read_only
+
+    def set_name(self, name):
+        self.view_name = name
+
+    def name(self):
+        return getattr(self, 'view_name', '')
+
+    def run_command(self, name, args=None):
+        import sublime_plugin
+        sublime_plugin.find_command(name, sublime_plugin.TextCommand)(self).run(
+            None, **(args or {}))
+
+    def replace(self, edit, region, text):
+        self.text = self.text[:region.begin()] + text + self.text[region.end():]
+
+    def insert(self, edit, point, text):
+        self.text = self.text[:point] + text + self.text[point:]
+        return len(text)
+
+    def erase(self, edit, region):
+        self.text = self.text[:region.begin()] + self.text[region.end():]
+
+    def add_regions(self, key, regions, scope='', icon='', flags=0):
+        self.regions[key] = list(regions)
+
+    def erase_regions(self, key):
+        self.regions.pop(key, None)
+
+    def rowcol(self, point):
+        row = self.text.count('\n', 0, point)
+        return row, point - self.text.rfind('\n', 0, point) - 1
+
+    def viewport_extent(self):
+        return 800.0, 600.0
+
+    def line_height(self):
+        return 20.0
+
+    def em_width(self):
+        return 10.0
+
+
+class Window(object):
+    def __init__(self):
+        self.window_id = next(IDS)
+        self.window_views = []
+
+    def id(self):
+        return self.window_id
+
+    def new_file(self):
+        view = View(self)
+        self.window_views.append(view)
+        return view
+
+    def views(self):
+        return list(self.window_views)
+
+    def active_view(self):
+        return self.window_views[-1] if self.window_views else None
@@ -0,0 +1,38 @@
+import re
+
+
+class EventListener(object):
+    pass
+
+
+class ApplicationCommand(object):
+    pass
+
+
+class WindowCommand(object):
+    def __init__(self, window):
+        self.window = window
+
+
+class TextCommand(object):
+    def __init__(self, view):
+        self.view = view
+
+
+def command_name(class_name):
+    name = re.sub(r'(?<=[a-z])([A-Z])', r'_\1', class_name).lower()
+    return name[:-len('_command')] if name.endswith('_command') else name
+
+
+def subclasses(base):
+    for subclass in base.__subclasses__():
+        yield subclass
+        for nested in subclasses(subclass):
+            yield nested
+
+
+def find_command(name, base):
+    for command in subclasses(base):
+        if command_name(command.__name__) == name:
+            return command
+    raise KeyError(name)
@@ -0,0 +1,225 @@
+import argparse
+import importlib
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import timeit
+import types
+
+
+BENCHMARKS = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(BENCHMARKS)
+PACKAGE = 'Games'
+DEFAULT_SIZES = '3x3,6x7,20x20,50x50,100x100,200x200'
+CASES = []
+
+sys.path.insert(0, os.path.join(BENCHMARKS, 'fake'))
+import sublime  # noqa: E402
+
+
+def case(name):
+    def decorator(function):
+        CASES.append((name, function))
+        return function
+    return decorator
+
+
+def load_package():
+    if PACKAGE not in sys.modules:
+        package = types.ModuleType(PACKAGE)
+        package.__path__ = [ROOT]
+        sys.modules[PACKAGE] = package
+    modules = {}
+    for name in ('base', 'registry', 'touch', 'games.in_a_row'):
+        modules[name] = importlib.import_module('%s.%s' % (PACKAGE, name))
+    return modules
+
+
+def measure(function, number, repeat):
+    times = [x / number for x in timeit.Timer(function).repeat(repeat, number)]
+    times.sort()
+    return {
+        'calls': number * repeat, 'min': times[0], 'median': times[len(times) // 2],
+        'max': times[-1]
+    }
+
+
+def calls_for(cells, budget=200000):
+    return max(1, min(1000, budget // cells))
+
+
+def new_game(modules, rows, cols):
+    game = modules['games.in_a_row'].InARowGame(
+        rows=rows, cols=cols, target=min(4, rows, cols), virtualize=False)
+    sublime.run_timeouts()
+    return game
+
+
+@case('in_a_row.is_game_over')
+def bench_is_game_over(modules, rows, cols, repeat):
+    game = new_game(modules, rows, cols)
+    rng = random.Random(rows * 1000 + cols)
+    for index in range(len(game.board)):
+        game.board[index] = rng.randint(1, game.players)
+    indexes = list(range(len(game.board)))
+    rng.shuffle(indexes)
+    indexes = indexes[:1000]
+
+    def run():
+        for index in indexes:
+            game.is_game_over(index)
+    result = measure(run, calls_for(rows * cols * len(indexes), 1000000), repeat)
+    for key in ('min', 'median', 'max'):
+        result[key] /= len(indexes)
+    result['calls'] *= len(indexes)
+    return result
+
+
+@case('in_a_row.draw_board.full')
+def bench_draw_full(modules, rows, cols, repeat):
+    game = new_game(modules, rows, cols)
+
+    def run():
+        game.rendered = None
+        game.draw_board()
+    return measure(run, calls_for(rows * cols, 100000), repeat)
+
+
+@case('in_a_row.draw_board.move')
+def bench_draw_move(modules, rows, cols, repeat):
+    game = new_game(modules, rows, cols)
+    game.draw_board()
+    columns = [x % cols for x in range(cols * rows)]
+
+    def run():
+        if game.game_over or not columns:
+            game.reset_state()
+            columns[:] = [x % cols for x in range(cols * rows)]
+        game.apply_move(columns.pop())
+        game.draw_board()
+    return measure(run, calls_for(rows * cols, 100000), repeat)
+
+
+@case('touch.event_handler')
+def bench_event_handler(modules, rows, cols, repeat):
+    touch = modules['touch']
+    view = sublime.active_window().new_file()
+    count = rows * cols
+    regions = [sublime.Region(3 * x, 3 * x + 2) for x in range(count)]
+    touch.set_event_handlers(view, regions, [lambda *args: None] * count)
+    touch.set_event_throttle(view, -1)
+    rng = random.Random(count)
+    points = [rng.randint(0, 3 * count) for x in range(1000)]
+    selection = view.sel()
+
+    def run():
+        for point in points:
+            selection[0] = sublime.Region(point, point)
+            touch.event_handler(view)
+    result = measure(run, 10, repeat)
+    for key in ('min', 'median', 'max'):
+        result[key] /= len(points)
+    result['calls'] *= len(points)
+    result['handlers'] = count
+    touch.remove_view_events(view.id())
+    return result
+
+
+@case('base.generate_theme_xml')
+def bench_theme_xml(modules, rows, cols, repeat):
+    game = new_game(modules, rows, cols)
+    colors = [
+        {
+            'name': 'color%d' % x, 'scope': 'color%d' % x, 'background': '#%06x' % x,
+            'foreground': '#000000', 'caret': '#%06x' % x
+        } for x in range(rows)
+    ]
+    result = measure(lambda: game.generate_theme_xml(colors, uuid='bench'), 100, repeat)
+    result['colors'] = len(colors)
+    return result
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', 'HEAD'], cwd=ROOT, stderr=subprocess.STDOUT
+        ).decode('ascii').strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(sizes, names, repeat):
+    if not os.path.isdir(os.path.join(sublime.PACKAGES, 'User')):
+        os.makedirs(os.path.join(sublime.PACKAGES, 'User'))
+    modules = load_package()
+    results = []
+    for name, function in CASES:
+        if names and name not in names:
+            continue
+        for rows, cols in sizes:
+            result = function(modules, rows, cols, repeat)
+            result.update({'name': name, 'size': '%dx%d' % (rows, cols)})
+            results.append(result)
+            sys.stderr.write('%-28s %9s %12.3f us\n' % (name, result['size'], result['min'] * 1e6))
+    return {
+        'commit': git_commit(), 'python': platform.python_version(),
+        'platform': platform.platform(), 'time': time.time(), 'repeat': repeat,
+        'results': results
+    }
+
+
+def compare(report, baseline):
+    previous = dict(((x['name'], x['size']), x) for x in baseline['results'])
+    lines = ['%-28s %9s %12s %12s %8s' % ('Benchmark', 'Size', 'Before us', 'After us', 'Ratio')]
+    for result in report['results']:
+        before = previous.get((result['name'], result['size']))
+        if before is None:
+            continue
+        lines.append('%-28s %9s %12.3f %12.3f %7.2fx' % (
+            result['name'], result['size'], before['min'] * 1e6, result['min'] * 1e6,
+            result['min'] / (before['min'] or 1e-12)))
+    return '\n'.join(lines)
+
+
+def parse_sizes(text):
+    sizes = []
+    for size in text.split(','):
+        rows, cols = size.lower().split('x')
+        sizes.append((int(rows), int(cols)))
+    return sizes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python benchmarks/run.py',
+        description='Time the game hot paths against a fake sublime module and write JSON.'
+    )
+    parser.add_argument('--sizes', default=DEFAULT_SIZES, help='rowsxcols, comma separated')
+    parser.add_argument('--only', action='append', choices=[x[0] for x in CASES])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--output', help='write the JSON report here instead of stdout')
+    parser.add_argument('--compare', help='a previous JSON report to print ratios against')
+    args = parser.parse_args(argv)
+    try:
+        sizes = parse_sizes(args.sizes)
+    except ValueError:
+        parser.error('sizes look like 6x7,20x20')
+    report = run(sizes, args.only, args.repeat)
+    data = json.dumps(report, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, 'w') as output:
+            output.write(data + '\n')
+    else:
+        print(data)
+    if args.compare:
+        with open(args.compare) as baseline:
+            sys.stderr.write(compare(report, json.load(baseline)) + '\n')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
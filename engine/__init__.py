@@ -0,0 +1,8 @@
+from .book import BOOK_SIZE, OpeningBook, book_key, open_book
+from .lines import DIRECTIONS, LineTable, line_table
+from .rules import (
+    MARKS, STATUS_DRAW, STATUS_PLAYING, STATUS_WINNER, InARowRules, TicTacToeRules
+)
+from .search import Search, SearchTimeout, zobrist_key
+from .solver import encode_tic_tac_toe, solve_tic_tac_toe, tic_tac_toe_move, tic_tac_toe_table
+from .threats import ThreatTracker
@@ -0,0 +1,104 @@
+import mmap
+import struct
+
+from .search import WIN_SCORE, zobrist_key
+
+
+BOOK_MAGIC = b'GBK1'
+BOOK_HEADER = struct.Struct('<4sBBBxI')
+BOOK_RECORD = struct.Struct('<Qbbh')
+BOOK_SIZE = (6, 7, 4)
+BOOK_FLAGS = ('search', 'exact')
+SCORE_LIMIT = 32767
+BOOKS = {}
+
+
+def book_key(board, rows, cols):
+    key = mirror_key = 0
+    for index, value in enumerate(board):
+        if value:
+            row, col = divmod(index, cols)
+            key ^= zobrist_key(index, value)
+            mirror_key ^= zobrist_key(row * cols + cols - 1 - col, value)
+    if mirror_key < key:
+        return mirror_key, True
+    return key, False
+
+
+def book_score(value, rows, cols):
+    if abs(value) >= WIN_SCORE - rows * cols:
+        distance = WIN_SCORE - abs(value)
+        return SCORE_LIMIT - distance if value > 0 else distance - SCORE_LIMIT
+    return max(-SCORE_LIMIT + rows * cols + 1, min(SCORE_LIMIT - rows * cols - 1, value))
+
+
+class OpeningBook(object):
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, 'rb')
+        try:
+            self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, EnvironmentError):
+            self.file.close()
+            raise ValueError('Empty opening book %s' % path)
+        magic, rows, cols, target, count = BOOK_HEADER.unpack_from(
+            self.data.read(BOOK_HEADER.size).ljust(BOOK_HEADER.size, b'\0'))
+        if (
+            not magic == BOOK_MAGIC or
+            not len(self.data) == BOOK_HEADER.size + count * BOOK_RECORD.size
+        ):
+            self.close()
+            raise ValueError('Not an opening book %s' % path)
+        self.rows, self.cols, self.target, self.count = rows, cols, target, count
+
+    def __len__(self):
+        return self.count
+
+    def close(self):
+        self.data.close()
+        self.file.close()
+
+    def record(self, position):
+        return BOOK_RECORD.unpack_from(self.data, BOOK_HEADER.size + position * BOOK_RECORD.size)
+
+    def find(self, key):
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            record = self.record(middle)
+            if record[0] < key:
+                low = middle + 1
+            elif record[0] > key:
+                high = middle
+            else:
+                return record
+        return None
+
+    def lookup(self, board):
+        if not len(board) == self.rows * self.cols:
+            return None
+        key, mirrored = book_key(board, self.rows, self.cols)
+        record = self.find(key)
+        if record is None:
+            return None
+        move, flag, score = record[1:]
+        if mirrored:
+            move = self.cols - 1 - move
+        return move, score, BOOK_FLAGS[flag]
+
+
+def open_book(path):
+    if path not in BOOKS:
+        try:
+            BOOKS[path] = OpeningBook(path)
+        except (IOError, OSError, ValueError, struct.error):
+            BOOKS[path] = None
+    return BOOKS[path]
+
+
+def write_book(path, records):
+    rows, cols, target = BOOK_SIZE
+    with open(path, 'wb') as book_file:
+        book_file.write(BOOK_HEADER.pack(BOOK_MAGIC, rows, cols, target, len(records)))
+        for key in sorted(records):
+            book_file.write(BOOK_RECORD.pack(key, *records[key]))
@@ -0,0 +1,91 @@
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+
+from .book import BOOK_SIZE, book_key, book_score, write_book
+from .rules import STATUS_PLAYING, InARowRules
+from .search import WIN_SCORE, Search
+
+
+WORKER_SEARCHES = {}
+
+
+def search_position(task):
+    moves, time_budget, max_depth = task
+    rows, cols, target = BOOK_SIZE
+    rules = InARowRules(rows, cols, target, 2)
+    for col in moves:
+        rules.apply_move(col)
+    mover = rules.whos_move
+    if mover not in WORKER_SEARCHES:
+        WORKER_SEARCHES[mover] = Search(rows, cols, target, 2, mover)
+    move, value, depth = WORKER_SEARCHES[mover].analyse(
+        rules.board, rules.heights, mover, time_budget, max_depth)
+    exact = depth == rules.empty_count or abs(value) >= WIN_SCORE - rows * cols
+    key, mirrored = book_key(rules.board, rows, cols)
+    if mirrored:
+        move = cols - 1 - move
+    return key, move, int(exact), book_score(value, rows, cols)
+
+
+def opening_positions(plies):
+    rows, cols, target = BOOK_SIZE
+    seen = set()
+    pending = [()]
+    while pending:
+        moves = pending.pop()
+        rules = InARowRules(rows, cols, target, 2)
+        status = STATUS_PLAYING
+        for col in moves:
+            status = rules.apply_move(col)
+        key = book_key(rules.board, rows, cols)[0]
+        if not status == STATUS_PLAYING or key in seen:
+            continue
+        seen.add(key)
+        yield moves
+        if len(moves) < plies:
+            pending.extend(moves + (x,) for x in rules.legal_moves())
+
+
+def build(options, processes=None):
+    tasks = [(x, options['think_time'], options['depth'])
+             for x in opening_positions(options['plies'])]
+    records = {}
+    pool = multiprocessing.Pool(processes)
+    try:
+        for key, move, exact, score in pool.imap_unordered(search_position, tasks, 4):
+            if key not in records or exact >= records[key][1]:
+                records[key] = (move, exact, score)
+    finally:
+        pool.close()
+        pool.join()
+    return records
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m engine.build_book',
+        description='Build the opening book for 6x7 In A Row 4.'
+    )
+    parser.add_argument('output', help='book file to write, e.g. Packages/User/in_a_row.book')
+    parser.add_argument('--plies', type=int, default=4, help='search every opening this deep')
+    parser.add_argument('--depth', type=int, default=10)
+    parser.add_argument('--think-time', type=float, default=5.0)
+    parser.add_argument('--processes', type=int, default=None)
+    args = parser.parse_args(argv)
+    options = {
+        'plies': args.plies, 'depth': args.depth, 'think_time': args.think_time
+    }
+    started = time.time()
+    records = build(options, args.processes)
+    write_book(args.output, records)
+    print('Wrote %d positions (%d exact) to %s in %.1fs, %d bytes' % (
+        len(records), len([x for x in records.values() if x[1]]), args.output,
+        time.time() - started, os.path.getsize(args.output)))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
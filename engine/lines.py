@@ -0,0 +1,175 @@
+from array import array
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+DIRECTIONS = ((0, 1), (1, 0), (1, 1), (1, -1))
+LINE_TABLES = {}
+LINE_TABLE_LIMIT = 16
+
+
+class LineTable(object):
+    def __init__(self, rows, cols, target):
+        self.rows = rows
+        self.cols = cols
+        self.target = target
+        self.starts = self.steps = self.matrix = None
+        self.cell_lines = {}
+        self.shared_lines = {}
+
+    def __len__(self):
+        return len(self.build()[0])
+
+    def build(self):
+        if self.starts is None:
+            starts = array('i')
+            steps = array('i')
+            for row_step, col_step in DIRECTIONS:
+                step = row_step * self.cols + col_step
+                for row in range(self.rows):
+                    if not 0 <= row + (self.target - 1) * row_step < self.rows:
+                        continue
+                    for col in range(self.cols):
+                        if 0 <= col + (self.target - 1) * col_step < self.cols:
+                            starts.append(row * self.cols + col)
+                            steps.append(step)
+            self.starts, self.steps = starts, steps
+        return self.starts, self.steps
+
+    def line(self, number):
+        starts, steps = self.build()
+        start, step = starts[number], steps[number]
+        return tuple(range(start, start + self.target * step, step))
+
+    def find_lines(self, index):
+        row, col = divmod(index, self.cols)
+        lines = []
+        for direction, (row_step, col_step) in enumerate(DIRECTIONS):
+            step = row_step * self.cols + col_step
+            for offset in range(self.target):
+                start_row = row - offset * row_step
+                start_col = col - offset * col_step
+                end_row = start_row + (self.target - 1) * row_step
+                end_col = start_col + (self.target - 1) * col_step
+                if (
+                    0 <= start_row < self.rows and 0 <= start_col < self.cols and
+                    0 <= end_row < self.rows and 0 <= end_col < self.cols
+                ):
+                    start = start_row * self.cols + start_col
+                    key = start * len(DIRECTIONS) + direction
+                    line = self.shared_lines.get(key)
+                    if line is None:
+                        line = self.shared_lines[key] = tuple(
+                            range(start, start + self.target * step, step))
+                    lines.append(line)
+        return tuple(lines)
+
+    def lines_through(self, index):
+        lines = self.cell_lines.get(index)
+        if lines is None:
+            lines = self.cell_lines[index] = self.find_lines(index)
+        return lines
+
+    def winner_at(self, board, index):
+        value = board[index]
+        if not value:
+            return 0
+        row, col = divmod(index, self.cols)
+        for row_step, col_step in DIRECTIONS:
+            count = 1
+            for sign in (1, -1):
+                next_row = row + sign * row_step
+                next_col = col + sign * col_step
+                while (
+                    count < self.target and
+                    0 <= next_row < self.rows and 0 <= next_col < self.cols and
+                    board[next_row * self.cols + next_col] == value
+                ):
+                    count += 1
+                    next_row += sign * row_step
+                    next_col += sign * col_step
+            if count >= self.target:
+                return value
+        return 0
+
+    def winner(self, board):
+        target = self.target
+        for start, step in zip(*self.build()):
+            value = board[start]
+            if not value:
+                continue
+            for cell in range(start + step, start + target * step, step):
+                if not board[cell] == value:
+                    break
+            else:
+                return value
+        return 0
+
+    def score(self, board, players, weights):
+        scores = [0] * players
+        target = self.target
+        for start, step in zip(*self.build()):
+            owner = count = 0
+            for cell in range(start, start + target * step, step):
+                value = board[cell]
+                if not value:
+                    continue
+                if not owner:
+                    owner = value
+                elif not owner == value:
+                    owner = -1
+                    break
+                count += 1
+            if owner > 0:
+                scores[owner - 1] += weights[count]
+        return scores
+
+    def line_matrix(self):
+        if self.matrix is None:
+            starts, steps = self.build()
+            starts = numpy.array(starts, dtype=numpy.intp)
+            steps = numpy.array(steps, dtype=numpy.intp)
+            self.matrix = starts[:, numpy.newaxis] + (
+                steps[:, numpy.newaxis] * numpy.arange(self.target, dtype=numpy.intp))
+        return self.matrix
+
+    def batch_winners(self, boards):
+        if numpy is None or not len(self):
+            return [self.winner(x) for x in boards]
+        values = board_array(boards)[:, self.line_matrix()]
+        first = values[:, :, 0]
+        full = (values == first[:, :, numpy.newaxis]).all(axis=2) & (first > 0)
+        winners = first[numpy.arange(len(first)), full.argmax(axis=1)]
+        return numpy.where(full.any(axis=1), winners, 0)
+
+    def batch_scores(self, boards, players, weights):
+        if numpy is None or not len(self):
+            return [self.score(x, players, weights) for x in boards]
+        values = board_array(boards)[:, self.line_matrix()]
+        filled = (values > 0).sum(axis=2)
+        weights = numpy.asarray(weights)
+        scores = numpy.zeros((len(values), players), dtype=weights.dtype)
+        for player in range(players):
+            count = (values == player + 1).sum(axis=2)
+            owned = (count == filled) & (count > 0)
+            scores[:, player] = numpy.where(owned, weights[count], 0).sum(axis=1)
+        return scores
+
+
+def board_array(boards):
+    if isinstance(boards, numpy.ndarray):
+        return boards
+    return numpy.array([list(x) for x in boards], dtype=numpy.int16)
+
+
+def line_table(rows, cols, target):
+    key = (rows, cols, target)
+    table = LINE_TABLES.get(key)
+    if table is None:
+        if len(LINE_TABLES) >= LINE_TABLE_LIMIT:
+            LINE_TABLES.clear()
+        table = LINE_TABLES[key] = LineTable(rows, cols, target)
+    return table
@@ -0,0 +1,171 @@
+from array import array
+
+from .lines import line_table
+
+
+STATUS_PLAYING = 0
+STATUS_WINNER = 1
+STATUS_DRAW = 2
+MARKS = ' XO'
+
+
+class InARowRules(object):
+    def __init__(self, rows=6, cols=7, target=4, players=2):
+        self.row_count = rows
+        self.col_count = cols
+        self.target = target
+        self.players = players
+        self.reset_state()
+
+    def reset_state(self):
+        self.lines = line_table(self.row_count, self.col_count, self.target)
+        self.board = bytearray(self.row_count * self.col_count)
+        self.heights = array('i', [0]) * self.col_count
+        self.game_over = False
+        self.whos_move = 0
+        self.winner = None
+        self.empty_count = self.row_count * self.col_count
+        self.moves = array('B' if self.col_count <= 256 else 'H')
+        self.history = []
+        self.redo_stack = []
+
+    def legal_moves(self):
+        if self.game_over:
+            return []
+        return [x for x in range(self.col_count) if self.heights[x] < self.row_count]
+
+    def drop_index(self, col):
+        if self.heights[col] >= self.row_count:
+            return None
+        return (self.row_count - 1 - self.heights[col]) * self.col_count + col
+
+    def apply_move(self, col):
+        dropped = self.drop_index(col)
+        if dropped is not None:
+            self.history.append(
+                (dropped, self.board[dropped], self.whos_move, self.winner, self.game_over))
+            self.redo_stack = []
+            self.heights[col] += 1
+            self.board[dropped] = self.whos_move + 1
+            self.moves.append(col)
+            self.empty_count -= 1
+            self.whos_move += 1
+        status = self.is_game_over(dropped)
+        if not status == STATUS_PLAYING:
+            self.whos_move -= 1
+            self.game_over = True
+            if status == STATUS_WINNER:
+                self.winner = self.whos_move
+        if self.whos_move == self.players:
+            self.whos_move = 0
+        return status
+
+    def undo_move(self):
+        if not self.history:
+            return None
+        index, value, self.whos_move, self.winner, self.game_over = self.history.pop()
+        col = self.moves.pop()
+        self.redo_stack.append(col)
+        self.heights[col] -= 1
+        self.board[index] = value
+        self.empty_count += 1
+        return index
+
+    def redo_move(self):
+        if not self.redo_stack:
+            return None
+        redo_stack = self.redo_stack
+        col = redo_stack.pop()
+        self.apply_move(col)
+        self.redo_stack = redo_stack
+        return self.history[-1][0]
+
+    def winning_move(self, col, player):
+        index = self.drop_index(col)
+        if index is None:
+            return False
+        self.board[index] = player + 1
+        try:
+            return self.is_winner(index)
+        finally:
+            self.board[index] = 0
+
+    def is_winner(self, index):
+        return bool(self.lines.winner_at(self.board, index))
+
+    def is_game_over(self, index):
+        if index is None:
+            return STATUS_PLAYING
+        if self.is_winner(index):
+            return STATUS_WINNER
+        return STATUS_DRAW if not self.empty_count else STATUS_PLAYING
+
+
+class TicTacToeRules(object):
+    players = 2
+    lines = line_table(3, 3, 3)
+
+    def __init__(self):
+        self.reset_state()
+
+    def reset_state(self):
+        self.board = bytearray(9)
+        self.game_over = False
+        self.whos_move = 'X'
+        self.winner = None
+        self.moves = array('B')
+        self.history = []
+        self.redo_stack = []
+
+    def legal_moves(self):
+        if self.game_over:
+            return []
+        return [x for x in range(9) if not self.board[x]]
+
+    def apply_move(self, index):
+        self.history.append(
+            (index, self.board[index], self.whos_move, self.winner, self.game_over))
+        self.redo_stack = []
+        self.board[index] = MARKS.index(self.whos_move)
+        self.moves.append(index)
+        status = self.is_game_over(index)
+        if status == STATUS_PLAYING:
+            self.whos_move = 'X' if self.whos_move == 'O' else 'O'
+        else:
+            self.game_over = True
+            if status == STATUS_WINNER:
+                self.winner = self.whos_move
+        return status
+
+    def undo_move(self):
+        if not self.history:
+            return None
+        index, self.board[index], self.whos_move, self.winner, self.game_over = self.history.pop()
+        self.redo_stack.append(self.moves.pop())
+        return index
+
+    def redo_move(self):
+        if not self.redo_stack:
+            return None
+        redo_stack = self.redo_stack
+        index = redo_stack.pop()
+        self.apply_move(index)
+        self.redo_stack = redo_stack
+        return index
+
+    def winning_move(self, index, player):
+        if self.board[index]:
+            return False
+        self.board[index] = player + 1
+        try:
+            return self.is_winner(index)
+        finally:
+            self.board[index] = 0
+
+    def is_winner(self, index):
+        return bool(self.lines.winner_at(self.board, index))
+
+    def is_game_over(self, index):
+        if self.is_winner(index):
+            return STATUS_WINNER
+        return STATUS_PLAYING if 0 in self.board else STATUS_DRAW
@@ -0,0 +1,186 @@
+import threading
+import time
+
+from .lines import line_table
+
+
+WIN_SCORE = 1 << 30
+EXACT = 0
+LOWER = 1
+UPPER = 2
+MASK = (1 << 64) - 1
+TABLE_LIMIT = 1 << 20
+
+
+class SearchTimeout(Exception):
+    pass
+
+
+def zobrist_key(index, value):
+    key = (index * 8 + value + 0x9e3779b97f4a7c15) & MASK
+    key = ((key ^ (key >> 30)) * 0xbf58476d1ce4e5b9) & MASK
+    key = ((key ^ (key >> 27)) * 0x94d049bb133111eb) & MASK
+    return key ^ (key >> 31)
+
+
+class Search(object):
+    def __init__(self, rows, cols, target, players, player):
+        self.rows = rows
+        self.cols = cols
+        self.target = target
+        self.players = players
+        self.player = player
+        self.weights = [0] + [8 ** x for x in range(target)]
+        self.lines = line_table(rows, cols, target)
+        self.order = sorted(range(cols), key=lambda x: abs(x - (cols - 1) / 2.0))
+        self.keys = {}
+        self.table = {}
+        self.lock = threading.Lock()
+        self.board = self.heights = self.deadline = None
+        self.score = self.hash = self.empty = self.nodes = 0
+
+    def best_move(self, board, heights, mover, time_budget=1.0, max_depth=None):
+        return self.analyse(board, heights, mover, time_budget, max_depth)[0]
+
+    def analyse(self, board, heights, mover, time_budget=1.0, max_depth=None):
+        with self.lock:
+            return self.iterate(board, heights, mover, time_budget, max_depth)
+
+    def iterate(self, board, heights, mover, time_budget, max_depth=None):
+        if len(self.table) > TABLE_LIMIT:
+            self.table.clear()
+        self.deadline = time.time() + time_budget
+        self.board = [0] * len(board)
+        self.heights = list(heights)
+        self.score = self.hash = self.nodes = 0
+        for index, value in enumerate(board):
+            if value:
+                self.score += self.place(index, value)[0]
+                self.board[index] = value
+                self.hash ^= self.key(index, value)
+        self.empty = self.board.count(0)
+        moves = [x for x in self.order if self.heights[x] < self.rows]
+        if not moves:
+            return None, 0, 0
+        best = moves[0]
+        best_value = depth = 0
+        limit = self.empty if max_depth is None else min(self.empty, max_depth)
+        while depth < limit:
+            try:
+                value = self.negamax(mover, depth + 1, -WIN_SCORE, WIN_SCORE, 0)
+            except SearchTimeout:
+                break
+            depth += 1
+            best = self.table[self.hash][3]
+            best_value = value
+            if abs(value) >= WIN_SCORE - self.rows * self.cols:
+                break
+        return best, best_value, depth
+
+    def key(self, index, value):
+        key = self.keys.get((index, value))
+        if key is None:
+            key = self.keys[(index, value)] = zobrist_key(index, value)
+        return key
+
+    def place(self, index, value):
+        board = self.board
+        delta = 0
+        won = False
+        for line in self.lines.lines_through(index):
+            owner = count = 0
+            for cell in line:
+                if board[cell] and not cell == index:
+                    if not owner:
+                        owner = board[cell]
+                    elif not owner == board[cell]:
+                        owner = -1
+                        break
+                    count += 1
+            if owner < 0:
+                continue
+            delta -= self.window_value(owner, count)
+            if not owner or owner == value:
+                delta += self.window_value(value, count + 1)
+                if count + 1 >= self.target:
+                    won = True
+        return delta, won
+
+    def window_value(self, owner, count):
+        if not owner:
+            return 0
+        if owner - 1 == self.player:
+            return self.weights[count]
+        return -self.weights[count]
+
+    def play(self, col, mover):
+        index = (self.rows - 1 - self.heights[col]) * self.cols + col
+        value = mover + 1
+        delta, won = self.place(index, value)
+        self.board[index] = value
+        self.heights[col] += 1
+        self.empty -= 1
+        self.score += delta
+        self.hash ^= self.key(index, value)
+        return index, delta, won
+
+    def undo(self, col, index, delta):
+        self.hash ^= self.key(index, self.board[index])
+        self.score -= delta
+        self.empty += 1
+        self.heights[col] -= 1
+        self.board[index] = 0
+
+    def negamax(self, mover, depth, alpha, beta, ply):
+        self.nodes += 1
+        if not self.nodes & 1023 and time.time() > self.deadline:
+            raise SearchTimeout()
+        if not self.empty:
+            return 0
+        if not depth:
+            return self.score if mover == self.player else -self.score
+        original_alpha = alpha
+        best_move = None
+        entry = self.table.get(self.hash)
+        if entry is not None:
+            entry_depth, entry_value, entry_flag, best_move = entry
+            if entry_depth >= depth:
+                if entry_flag == EXACT:
+                    return entry_value
+                if entry_flag == LOWER:
+                    alpha = max(alpha, entry_value)
+                else:
+                    beta = min(beta, entry_value)
+                if alpha >= beta:
+                    return entry_value
+        moves = [x for x in self.order if self.heights[x] < self.rows and not x == best_move]
+        if best_move is not None and self.heights[best_move] < self.rows:
+            moves.insert(0, best_move)
+        next_mover = (mover + 1) % self.players
+        same_side = (next_mover == self.player) == (mover == self.player)
+        best = -WIN_SCORE
+        for col in moves:
+            index, delta, won = self.play(col, mover)
+            try:
+                if won:
+                    value = WIN_SCORE - ply
+                elif same_side:
+                    value = self.negamax(next_mover, depth - 1, alpha, beta, ply + 1)
+                else:
+                    value = -self.negamax(next_mover, depth - 1, -beta, -alpha, ply + 1)
+            finally:
+                self.undo(col, index, delta)
+            if value > best:
+                best = value
+                best_move = col
+            alpha = max(alpha, value)
+            if alpha >= beta:
+                break
+        if best <= original_alpha:
+            flag = UPPER
+        elif best >= beta:
+            flag = LOWER
+        else:
+            flag = EXACT
+        self.table[self.hash] = (depth, best, flag, best_move)
+        return best
@@ -0,0 +1,57 @@
+from array import array
+
+from .lines import line_table
+
+
+TIC_TAC_TOE_POWERS = tuple(3 ** x for x in range(9))
+TIC_TAC_TOE_TABLE = None
+UNSOLVED = -128
+
+
+def encode_tic_tac_toe(cells):
+    return sum(x * y for x, y in zip(cells, TIC_TAC_TOE_POWERS))
+
+
+def solve_tic_tac_toe():
+    moves = array('b', [-1]) * 3 ** len(TIC_TAC_TOE_POWERS)
+    scores = array('b', [UNSOLVED]) * len(moves)
+    lines = line_table(3, 3, 3)
+
+    def solve(cells, code, mover, empty):
+        if not scores[code] == UNSOLVED:
+            return scores[code]
+        best = best_move = None
+        for index in range(9):
+            if cells[index]:
+                continue
+            cells[index] = mover
+            if lines.winner_at(cells, index):
+                value = empty
+            elif empty == 1:
+                value = 0
+            else:
+                value = -solve(
+                    cells, code + mover * TIC_TAC_TOE_POWERS[index], 3 - mover, empty - 1)
+            cells[index] = 0
+            if best is None or value > best:
+                best = value
+                best_move = index
+        moves[code] = best_move
+        scores[code] = best
+        return best
+
+    solve([0] * 9, 0, 1, 9)
+    return moves, scores
+
+
+def tic_tac_toe_table():
+    global TIC_TAC_TOE_TABLE
+    if TIC_TAC_TOE_TABLE is None:
+        TIC_TAC_TOE_TABLE = solve_tic_tac_toe()
+    return TIC_TAC_TOE_TABLE
+
+
+def tic_tac_toe_move(cells):
+    move = tic_tac_toe_table()[0][encode_tic_tac_toe(cells)]
+    if move >= 0:
+        return move
@@ -0,0 +1,60 @@
+BLOCKED = -1
+
+
+class ThreatTracker(object):
+    def __init__(self, lines, players):
+        self.lines = lines
+        self.players = players
+        self.reset()
+
+    def reset(self):
+        self.line_states = {}
+        self.open_counts = [0] * self.players
+        self.threats = [{} for x in range(self.players)]
+
+    def rebuild(self, board):
+        self.reset()
+        partial = bytearray(len(board))
+        for index, value in enumerate(board):
+            if value:
+                partial[index] = value
+                self.place(partial, index, value)
+
+    def place(self, board, index, value):
+        target = self.lines.target
+        for line in self.lines.lines_through(index):
+            owner, count = self.line_states.get(line, (0, 0))
+            if owner == BLOCKED:
+                continue
+            if owner and count == target - 1:
+                self.remove_threat(owner, index)
+            if owner and not owner == value:
+                self.line_states[line] = (BLOCKED, 0)
+                self.open_counts[owner - 1] -= 1
+                continue
+            if not owner:
+                self.open_counts[value - 1] += 1
+            count += 1
+            self.line_states[line] = (value, count)
+            if count == target - 1:
+                for cell in line:
+                    if not board[cell]:
+                        self.add_threat(value, cell)
+                        break
+
+    def add_threat(self, value, cell):
+        cells = self.threats[value - 1]
+        cells[cell] = cells.get(cell, 0) + 1
+
+    def remove_threat(self, value, cell):
+        cells = self.threats[value - 1]
+        if cells.get(cell, 0) > 1:
+            cells[cell] -= 1
+        else:
+            cells.pop(cell, None)
+
+    def winning_cells(self, player):
+        return self.threats[player]
+
+    def open_lines(self, player):
+        return self.open_counts[player]
@@ -0,0 +1,234 @@
+import argparse
+import importlib
+import multiprocessing
+import random
+import sys
+import time
+
+from .rules import STATUS_PLAYING, InARowRules, TicTacToeRules
+from .search import Search
+from .solver import tic_tac_toe_move
+
+
+AGENTS = {}
+WORKER_AGENTS = {}
+
+
+def agent(name):
+    def decorator(agent_class):
+        AGENTS[name] = agent_class
+        return agent_class
+    return decorator
+
+
+@agent('random')
+class RandomAgent(object):
+    def __init__(self, rules, player, options):
+        self.player = player
+
+    def move(self, rules, rng):
+        return rng.choice(rules.legal_moves())
+
+
+@agent('greedy')
+class GreedyAgent(RandomAgent):
+    def move(self, rules, rng):
+        moves = rules.legal_moves()
+        for player in [self.player] + [x for x in range(rules.players) if not x == self.player]:
+            winning = [x for x in moves if rules.winning_move(x, player)]
+            if winning:
+                return rng.choice(winning)
+        return rng.choice(moves)
+
+
+@agent('search')
+class SearchAgent(RandomAgent):
+    def __init__(self, rules, player, options):
+        super(SearchAgent, self).__init__(rules, player, options)
+        self.think_time = options['think_time']
+        self.depth = options['depth']
+        self.search = None
+        if isinstance(rules, InARowRules):
+            self.search = Search(
+                rules.row_count, rules.col_count, rules.target, rules.players, player)
+
+    def move(self, rules, rng):
+        if self.search is None:
+            return tic_tac_toe_move(rules.board)
+        return self.search.best_move(
+            rules.board, rules.heights, self.player, self.think_time, self.depth)
+
+
+def load_agent(spec):
+    if spec in AGENTS:
+        return AGENTS[spec]
+    if ':' not in spec:
+        raise ValueError('Unknown agent %r, expected one of %s or module:Class' % (
+            spec, ', '.join(sorted(AGENTS))))
+    module, name = spec.split(':', 1)
+    return getattr(importlib.import_module(module), name)
+
+
+def new_rules(options):
+    if options['game'] == 'tic_tac_toe':
+        return TicTacToeRules()
+    return InARowRules(options['rows'], options['cols'], options['target'], options['players'])
+
+
+def seat_player(rules):
+    if isinstance(rules, TicTacToeRules):
+        return 'XO'.index(rules.whos_move)
+    return rules.whos_move
+
+
+def check_rules(rules):
+    errors = []
+    if isinstance(rules, InARowRules):
+        if not sum(rules.heights) == len(rules.moves):
+            errors.append('heights do not match move count')
+        if not rules.empty_count == rules.board.count(0):
+            errors.append('empty count does not match board')
+    elif not len(rules.board) - rules.board.count(0) == len(rules.moves):
+        errors.append('board does not match move count')
+    while rules.moves:
+        rules.undo_move()
+    if any(rules.board):
+        errors.append('undo did not clear the board')
+    return errors
+
+
+def play_game(task):
+    number, seats, options = task
+    rng = random.Random(options['seed'] * 1000003 + number)
+    rules = new_rules(options)
+    agents = []
+    for player, spec in enumerate(seats):
+        key = (spec, player)
+        if key not in WORKER_AGENTS:
+            WORKER_AGENTS[key] = load_agent(spec)(rules, player, options)
+        agents.append(WORKER_AGENTS[key])
+    started = time.time()
+    status = STATUS_PLAYING
+    while status == STATUS_PLAYING:
+        move = agents[seat_player(rules)].move(rules, rng)
+        if move not in rules.legal_moves():
+            raise ValueError('Agent %s played illegal move %r' % (seats[seat_player(rules)], move))
+        status = rules.apply_move(move)
+    seconds = time.time() - started
+    winner = None
+    if rules.winner is not None:
+        winner = seat_player(rules)
+    length = len(rules.moves)
+    errors = check_rules(rules) if options['check'] else []
+    return seats, winner, length, seconds, errors
+
+
+def tasks(agents, options):
+    for number in range(options['games']):
+        shift = number % len(agents)
+        yield number, agents[shift:] + agents[:shift], options
+
+
+def run(agents, options, processes=None):
+    results = {
+        'games': 0, 'draws': 0, 'moves': 0, 'seconds': 0.0, 'lengths': [], 'errors': [],
+        'agents': dict((x, {'games': 0, 'wins': 0, 'draws': 0}) for x in agents),
+        'seats': [0] * len(agents)
+    }
+    started = time.time()
+    pool = multiprocessing.Pool(processes)
+    try:
+        chunk = max(1, options['games'] // (8 * (processes or multiprocessing.cpu_count())))
+        for seats, winner, length, seconds, errors in pool.imap_unordered(
+            play_game, tasks(agents, options), chunk
+        ):
+            results['games'] += 1
+            results['moves'] += length
+            results['seconds'] += seconds
+            results['lengths'].append(length)
+            results['errors'].extend(errors)
+            for spec in set(seats):
+                results['agents'][spec]['games'] += 1
+            if winner is None:
+                results['draws'] += 1
+                for spec in set(seats):
+                    results['agents'][spec]['draws'] += 1
+            else:
+                results['agents'][seats[winner]]['wins'] += 1
+                results['seats'][winner] += 1
+    finally:
+        pool.close()
+        pool.join()
+    results['wall'] = time.time() - started
+    return results
+
+
+def format_results(results):
+    lines = ['%-24s %8s %8s %8s %8s' % ('Agent', 'Games', 'Wins', 'Win %', 'Draw %')]
+    for spec, counts in sorted(results['agents'].items()):
+        games = counts['games'] or 1
+        lines.append('%-24s %8d %8d %7.1f%% %7.1f%%' % (
+            spec, counts['games'], counts['wins'],
+            100.0 * counts['wins'] / games, 100.0 * counts['draws'] / games
+        ))
+    games = results['games'] or 1
+    lengths = results['lengths'] or [0]
+    lines.append('')
+    lines.append('Seat wins: %s' % ', '.join(
+        '%d: %.1f%%' % (x + 1, 100.0 * y / games) for x, y in enumerate(results['seats'])))
+    lines.append('Games: %d  Draws: %.1f%%' % (results['games'], 100.0 * results['draws'] / games))
+    lines.append('Game length: mean %.1f  min %d  max %d' % (
+        float(sum(lengths)) / len(lengths), min(lengths), max(lengths)))
+    lines.append('Moves/s: %.0f per process, %.0f overall  Games/s: %.1f  Wall: %.2fs' % (
+        results['moves'] / (results['seconds'] or 1e-9),
+        results['moves'] / (results['wall'] or 1e-9),
+        results['games'] / (results['wall'] or 1e-9),
+        results['wall']
+    ))
+    if results['errors']:
+        lines.append('Rule errors: %d (first: %s)' % (
+            len(results['errors']), results['errors'][0]))
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m engine.tournament',
+        description='Play games between agents without Sublime Text and report the results.'
+    )
+    parser.add_argument('agents', nargs='*', default=['random', 'greedy'], help=(
+        'one agent per seat, seats rotate every game: %s or module:Class' % ', '.join(
+            sorted(AGENTS))))
+    parser.add_argument('--game', choices=('in_a_row', 'tic_tac_toe'), default='in_a_row')
+    parser.add_argument('--rows', type=int, default=6)
+    parser.add_argument('--cols', type=int, default=7)
+    parser.add_argument('--target', type=int, default=4)
+    parser.add_argument('--games', type=int, default=1000)
+    parser.add_argument('--processes', type=int, default=None)
+    parser.add_argument('--think-time', type=float, default=0.05)
+    parser.add_argument('--depth', type=int, default=None)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument(
+        '--check', action='store_true', help='verify rule invariants after every game')
+    args = parser.parse_args(argv)
+    if args.game == 'tic_tac_toe' and not len(args.agents) == 2:
+        parser.error('tic tac toe needs exactly two agents')
+    if len(args.agents) < 2:
+        parser.error('at least two agents are needed')
+    for spec in args.agents:
+        try:
+            load_agent(spec)
+        except (ValueError, ImportError, AttributeError) as error:
+            parser.error(str(error))
+    options = {
+        'game': args.game, 'rows': args.rows, 'cols': args.cols, 'target': args.target,
+        'players': len(args.agents), 'games': args.games, 'think_time': args.think_time,
+        'depth': args.depth, 'seed': args.seed, 'check': args.check
+    }
+    results = run(args.agents, options, args.processes)
+    print(format_results(results))
+    return 1 if results['errors'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
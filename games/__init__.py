@@ -0,0 +1,16 @@
+if '.' in __name__:
+    from ..base import Game, GridLayout, Template
+    from ..engine import (
+        BOOK_SIZE, MARKS, STATUS_PLAYING, InARowRules, Search, ThreatTracker, TicTacToeRules,
+        open_book, tic_tac_toe_move
+    )
+    from ..touch import run_async, set_event_handlers
+    from ..stats import timed
+else:
+    from base import Game, GridLayout, Template
+    from engine import (
+        BOOK_SIZE, MARKS, STATUS_PLAYING, InARowRules, Search, ThreatTracker, TicTacToeRules,
+        open_book, tic_tac_toe_move
+    )
+    from touch import run_async, set_event_handlers
+    from stats import timed
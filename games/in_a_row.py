@@ -0,0 +1,441 @@
+import os.path
+import weakref
+
+import sublime
+
+from . import (
+    BOOK_SIZE, STATUS_PLAYING, Game, GridLayout, InARowRules, Search, Template, ThreatTracker,
+    open_book, run_async, set_event_handlers, timed
+)
+
+
+PLAYER_COLORS = (
+    ('yellow', '#ffec38'),
+    ('red', '#ff3a2f'),
+    ('orange', '#ff7f00'),
+    ('blue', '#385eff'),
+    ('green', '#30ec34'),
+    ('magenta', '#dd5eff')
+)
+SCROLL_CONTROLS = (('<', 0, -1), ('^', -1, 0), ('v', 1, 0), ('>', 0, 1))
+MIN_WINDOW = 3
+DEFAULT_WINDOW = (20, 40)
+BOOK_NAME = 'in_a_row.book'
+ENDGAME_EMPTY = 12
+ENDGAME_TIME = 10.0
+LOG_VIRTUALIZE = 1
+LOG_THREATS = 2
+LOG_ANIMATE = 4
+
+
+class InARowGame(Game, InARowRules):
+    log_id = 1
+
+    def __init__(
+        self, view=None, rows=6, cols=7, target=4, players=2, computers=0, think_time=1.0,
+        virtualize=True, threats=False, animate=False
+    ):
+        super(InARowGame, self).__init__(view, settings={'name': 'In A Row'})
+        self.colors = [
+            {
+                'name': 'white', 'scope': 'white', 'background': '#ffffff',
+                'foreground': '#ffffff', 'caret': '#ffffff'
+            },
+            {
+                'name': 'yellow', 'scope': 'yellow', 'background': '#ffec38',
+                'foreground': '#000000', 'caret': '#ffec38'
+            },
+            {
+                'name': 'red', 'scope': 'red', 'background': '#ff3a2f',
+                'foreground': '#000000', 'caret': '#ff3a2f'
+            },
+            {
+                'name': 'orange', 'scope': 'orange', 'background': '#ff7f00',
+                'foreground': '#000000', 'caret': '#ff7f00'
+            },
+            {
+                'name': 'blue', 'scope': 'blue', 'background': '#385eff',
+                'foreground': '#000000', 'caret': '#385eff'
+            },
+            {
+                'name': 'green', 'scope': 'green', 'background': '#30ec34',
+                'foreground': '#000000', 'caret': '#30ec34'
+            },
+            {
+                'name': 'magenta', 'scope': 'magenta', 'background': '#dd5eff',
+                'foreground': '#000000', 'caret': '#dd5eff'
+            },
+            {
+                'name': 'hint', 'scope': 'hint', 'background': '#b8d8f5',
+                'foreground': '#000000', 'caret': '#b8d8f5'
+            },
+            {
+                'name': 'threat_win', 'scope': 'threat_win', 'background': '#b8f5b8',
+                'foreground': '#000000', 'caret': '#b8f5b8'
+            },
+            {
+                'name': 'threat_block', 'scope': 'threat_block', 'background': '#f5b8b8',
+                'foreground': '#000000', 'caret': '#f5b8b8'
+            },
+        ]
+        if players > len(PLAYER_COLORS):
+            sublime.message_dialog('Max %d players.' % len(PLAYER_COLORS))
+            return
+
+        self.row_count = rows
+        self.col_count = cols
+        self.target = target
+        self.players = players
+        self.player_colors = PLAYER_COLORS[:players]
+        self.computers = set(range(players - min(computers, players), players))
+        self.think_time = think_time
+        self.searches = {}
+        self.search_token = None
+        self.virtualize = virtualize
+        self.window_row = self.window_col = 0
+        self.window_size = None
+        self.layout = None
+        self.show_threats = threats
+        self.animate = animate
+        self.falling = None
+        self.hint = None
+        self.cells = []
+        self.threat_tracker = None
+        self.color_names = ['white'] + [x[0] for x in self.player_colors]
+        self.winner = self.board = self.heights = self.game_over = self.whos_move = None
+        self.moves = None
+        self.empty_count = 0
+        self.reset_game()
+
+    def board_window(self):
+        if not self.virtualize:
+            return self.row_count, self.col_count
+        width, height = self.view.viewport_extent()
+        line_height = self.view.line_height()
+        em_width = self.view.em_width()
+        if width <= 0 or height <= 0 or line_height <= 0 or em_width <= 0:
+            rows, cols = DEFAULT_WINDOW
+        else:
+            rows = max(MIN_WINDOW, int(height / line_height - 5) // 2)
+            cols = max(MIN_WINDOW, int(width / em_width - 1) // 3)
+        return min(rows, self.row_count), min(cols, self.col_count)
+
+    def scroll(self, rows=0, cols=0):
+        window_rows, window_cols = self.board_window()
+        window_row = max(0, min(self.row_count - window_rows, self.window_row + rows))
+        window_col = max(0, min(self.col_count - window_cols, self.window_col + cols))
+        if not (window_row, window_col) == (self.window_row, self.window_col):
+            self.window_row = window_row
+            self.window_col = window_col
+            self.request_draw()
+
+    def zoom(self, amount, clear=False):
+        super(InARowGame, self).zoom(amount, clear)
+        if self.virtualize:
+            sublime.set_timeout(self.weak_callback('resize_window'), 0)
+
+    def resize_window(self):
+        if self.view is not None and not self.board_window() == self.window_size:
+            self.request_draw()
+
+    def build_template(self, rows, cols, width, virtual):
+        template = Template()
+        template.add_slot('title', width)
+        template.add('\n')
+        border = '+--' * cols + '+\n'
+        middle = '|  ' * cols + '|\n'
+        template.cells = []
+        template.layout = GridLayout(
+            rows, cols, 3, origin_row=1, origin_col=1, row_height=2, lines=(0, 1))
+        board = template.size
+        for row in range(rows):
+            template.add(border)
+            begin = template.add(middle)
+            for col in range(cols):
+                template.cells.append(sublime.Region(begin + 3 * col + 1, begin + 3 * col + 3))
+        template.regions['board'] = sublime.Region(board, template.size)
+        template.add(border)
+        template.add_slot('players', width)
+        template.add('\n')
+        begin = template.add(self.centered_text('- | +', width))
+        template.regions['zoom_out'] = sublime.Region(begin, begin + int(width / 2))
+        template.regions['zoom_in'] = sublime.Region(begin + int(width / 2), begin + width)
+        template.add('\n')
+        template.scroll_regions = []
+        if virtual:
+            controls = self.centered_text('  '.join(x[0] for x in SCROLL_CONTROLS), width)
+            begin = template.add(controls) + controls.index(SCROLL_CONTROLS[0][0])
+            for i in range(len(SCROLL_CONTROLS)):
+                template.scroll_regions.append(sublime.Region(begin + 3 * i, begin + 3 * i + 1))
+            template.add('\n')
+        return template
+
+    @timed('draw_board')
+    def draw_board(self):
+        previous = self.window_size
+        window_rows, window_cols = self.window_size = self.board_window()
+        if previous is None or self.window_row + previous[0] >= self.row_count:
+            self.window_row = self.row_count - window_rows
+        self.window_row = max(0, min(self.row_count - window_rows, self.window_row))
+        self.window_col = max(0, min(self.col_count - window_cols, self.window_col))
+        virtual = not (window_rows == self.row_count and window_cols == self.col_count)
+        self.set_view_setting('in_a_row_virtual', virtual)
+        width = max(
+            3 * window_cols + 1, len('Player %s (CPU)' % self.players),
+            len('%s Players' % self.players)
+        )
+        template = self.template(window_rows, window_cols, width, virtual)
+        self.layout = template.layout
+        self.cells = template.cells
+        regions_to_add = {'white': [], 'hint': [], 'threat_win': [], 'threat_block': []}
+        regions_to_add.update(dict((x[0], []) for x in self.player_colors))
+        handler_regions = []
+        handlers = []
+        if self.game_over:
+            title = 'GAME OVER'
+        elif self.whos_move in self.computers:
+            title = 'Player %s (CPU)' % (self.whos_move + 1)
+        else:
+            title = 'Player %s' % (self.whos_move + 1)
+        data = template.render({
+            'title': self.centered_text(title, width),
+            'players': self.centered_text('%s Players' % self.players, width)
+        })
+        if not self.game_over or self.winner is not None:
+            color = self.player_colors[self.whos_move][0]
+            regions_to_add[color].append(template.regions['title'])
+            regions_to_add[color].append(template.regions['players'])
+
+        overlay = self.threat_cells(window_cols)
+        if self.hint is not None:
+            overlay[self.hint] = 'hint'
+        if self.falling is None:
+            regions_to_add['falling'] = []
+        else:
+            overlay[self.falling[0]] = 'white'
+        cells = iter(template.cells)
+        for row in range(self.window_row, self.window_row + window_rows):
+            begin = row * self.col_count + self.window_col
+            for index in range(begin, begin + window_cols):
+                name = overlay.get(index) or self.color_names[self.board[index]]
+                regions_to_add[name].append(next(cells))
+        if not self.game_over:
+            handler_regions.append(template.regions['board'])
+            handlers.append(self.weak_region_handler('click_region'))
+
+        if not self.game_over or self.winner is not None:
+            handler_regions.append(template.regions['zoom_out'])
+            handlers.append(self.weak_handler('zoom', -10, True))
+            handler_regions.append(template.regions['zoom_in'])
+            handlers.append(self.weak_handler('zoom', +10, True))
+
+        for region, control in zip(template.scroll_regions, SCROLL_CONTROLS):
+            handler_regions.append(region)
+            handlers.append(self.weak_handler(
+                'scroll',
+                control[1] * max(1, window_rows // 2), control[2] * max(1, window_cols // 2)))
+
+        if self.game_over:
+            handler_regions.append(sublime.Region(0, template.size))
+            handlers.append(self.weak_handler('reset_game'))
+
+        set_event_handlers(self.view, handler_regions, handlers)
+        self.render(data)
+        self.draw_regions(regions_to_add)
+
+    def threat_cells(self, window_cols):
+        overlay = {}
+        if self.threat_tracker is None or self.game_over:
+            return overlay
+        wins = self.threat_tracker.winning_cells(self.whos_move)
+        blocks = [
+            self.threat_tracker.winning_cells(x) for x in range(self.players)
+            if not x == self.whos_move
+        ]
+        for col in range(self.window_col, self.window_col + window_cols):
+            index = self.drop_index(col)
+            if index is None:
+                continue
+            if index in wins:
+                overlay[index] = 'threat_win'
+            elif [x for x in blocks if index in x]:
+                overlay[index] = 'threat_block'
+        return overlay
+
+    def toggle_threats(self, enabled=None):
+        self.show_threats = not self.show_threats if enabled is None else enabled
+        self.threat_tracker = None
+        if self.show_threats:
+            self.threat_tracker = ThreatTracker(self.lines, self.players)
+            self.threat_tracker.rebuild(self.board)
+        self.request_draw()
+
+    def book_move(self):
+        if not (self.row_count, self.col_count, self.target, self.players) == BOOK_SIZE + (2,):
+            return None
+        book = open_book(os.path.join(sublime.packages_path(), 'User', BOOK_NAME))
+        entry = book.lookup(self.board) if book is not None else None
+        if entry is not None and self.drop_index(entry[0]) is not None:
+            return entry[0]
+        return None
+
+    def show_hint(self):
+        col = None if self.game_over else self.book_move()
+        if col is None:
+            sublime.status_message('No book move for this position')
+            return
+        self.hint = self.drop_index(col)
+        self.request_draw()
+
+    def click_region(self, region, point):
+        cell = self.layout.cell(self.view, point)
+        if cell is not None:
+            self.click_handler(self.window_col + cell[1])
+
+    def click_handler(self, col):
+        if self.whos_move in self.computers:
+            return
+        self.play_column(col)
+
+    def play_column(self, col):
+        index = self.drop_index(col)
+        self.apply_move(col)
+        self.hint = None
+        self.clear_selection()
+        if self.animate and index is not None:
+            self.falling = [index, self.window_row - 1]
+        self.request_draw()
+        self.persist_log()
+        self.start_computer_move()
+
+    def step_animation(self):
+        if self.falling is None:
+            return False
+        index, row = self.falling
+        target_row, col = divmod(index, self.col_count)
+        window_rows, window_cols = self.window_size
+        row += 1
+        if (
+            row >= min(target_row, self.window_row + window_rows) or row < self.window_row or
+            not self.window_col <= col < self.window_col + window_cols
+        ):
+            self.falling = None
+            self.request_draw()
+            return False
+        self.falling[1] = row
+        cell = self.cells[(row - self.window_row) * window_cols + col - self.window_col]
+        self.draw_layer('falling', [cell], self.color_names[self.board[index]])
+        return True
+
+    def apply_move(self, col):
+        index = self.drop_index(col)
+        status = super(InARowGame, self).apply_move(col)
+        if index is not None and self.threat_tracker is not None:
+            self.threat_tracker.place(self.board, index, self.board[index])
+        if not status == STATUS_PLAYING:
+            self.set_color_scheme(background='#cccccc')
+        return status
+
+    def close(self):
+        super(InARowGame, self).close()
+        self.search_token = None
+        self.searches = {}
+
+    def is_computer_turn(self):
+        return self.whos_move in self.computers and len(self.computers) < self.players
+
+    def history_changed(self):
+        self.search_token = None
+        self.falling = self.hint = None
+        if self.threat_tracker is not None:
+            self.threat_tracker.rebuild(self.board)
+        super(InARowGame, self).history_changed()
+        self.start_computer_move()
+
+    def start_computer_move(self):
+        if self.game_over or self.whos_move not in self.computers:
+            return
+        token = self.search_token = object()
+        col = self.book_move()
+        if col is not None:
+            sublime.set_timeout(self.weak_callback('computer_move', token, col), 0)
+            return
+        player = self.whos_move
+        if player not in self.searches:
+            self.searches[player] = Search(
+                self.row_count, self.col_count, self.target, self.players, player)
+        search = self.searches[player]
+        board = bytearray(self.board)
+        heights = list(self.heights)
+        think_time = self.think_time
+        if self.empty_count <= ENDGAME_EMPTY:
+            think_time = max(think_time, ENDGAME_TIME)
+
+        game = weakref.ref(self)
+
+        def think():
+            col = search.best_move(board, heights, player, think_time)
+            instance = game()
+            if instance is not None:
+                sublime.set_timeout(instance.weak_callback('computer_move', token, col), 0)
+        run_async(think)
+
+    def computer_move(self, token, col):
+        if self.view is None or col is None or token is not self.search_token:
+            return
+        self.search_token = None
+        self.play_column(col)
+
+    @timed('is_game_over')
+    def is_game_over(self, index):
+        return super(InARowGame, self).is_game_over(index)
+
+    def reset_game(self):
+        self.color_scheme_path(background='#cccccc')
+        self.set_color_scheme()
+        self.reset_state()
+        self.request_draw()
+        self.persist_log()
+        self.start_computer_move()
+
+    def reset_state(self):
+        super(InARowGame, self).reset_state()
+        self.search_token = None
+        self.falling = self.hint = None
+        self.window_size = None
+        self.threat_tracker = None
+        if self.show_threats:
+            self.threat_tracker = ThreatTracker(self.lines, self.players)
+
+    def replay(self, moves):
+        self.reset_state()
+        for col in moves:
+            if col not in self.legal_moves():
+                self.reset_state()
+                raise ValueError('Illegal move %r in game log' % col)
+            self.apply_move(col)
+        self.request_draw()
+        self.persist_log()
+        self.start_computer_move()
+
+    def log_params(self):
+        return (
+            self.row_count, self.col_count, self.target, self.players,
+            len(self.computers), int(self.think_time * 1000),
+            LOG_VIRTUALIZE * self.virtualize + LOG_THREATS * bool(self.show_threats) +
+            LOG_ANIMATE * self.animate
+        )
+
+    @classmethod
+    def from_log(cls, view, params, moves):
+        if len(params) == 6:
+            params = tuple(params) + (LOG_VIRTUALIZE,)
+        rows, cols, target, players, computers, think_time, flags = params
+        if min(rows, cols, target) < 1 or not 1 <= players <= len(PLAYER_COLORS):
+            raise ValueError('Bad In A Row log parameters %r' % (params,))
+        game = cls(
+            view, rows, cols, target, players, computers, think_time / 1000.0,
+            bool(flags & LOG_VIRTUALIZE), bool(flags & LOG_THREATS), bool(flags & LOG_ANIMATE)
+        )
+        game.replay(moves)
+        return game
@@ -0,0 +1,159 @@
+import sublime
+
+from . import (
+    MARKS, STATUS_PLAYING, Game, GridLayout, Template, TicTacToeRules, set_event_handlers,
+    tic_tac_toe_move, timed
+)
+
+
+class TicTacToeGame(Game, TicTacToeRules):
+    log_id = 2
+
+    def __init__(self, view=None, computer=None):
+        super(TicTacToeGame, self).__init__(view, settings={'name': 'Tic Tac Toe'})
+        self.colors = [
+            {
+                'name': 'hint', 'scope': 'hint', 'background': '#ffec38',
+                'foreground': '#000000', 'caret': '#ffec38'
+            },
+        ]
+        self.computer = computer
+        self.cell_regions = []
+        self.layout = None
+        self.loaded = self.board = self.whos_move = self.moves = None
+        self.reset_game()
+
+    def build_template(self, rows, cols, width):
+        template = Template()
+        template.add_slot('title', width)
+        template.add('\n\n')
+        template.cells = []
+        template.layout = GridLayout(rows, cols, 4, origin_row=2, row_height=2)
+        for row in range(rows):
+            for col in range(cols):
+                begin = template.add(' ')
+                template.add_slot(row * cols + col, 1)
+                template.add(' |' if not col == cols - 1 else ' \n')
+                template.cells.append(sublime.Region(begin, begin + 3))
+            if not row == rows - 1:
+                template.add('+'.join(['---'] * cols) + '\n')
+        template.regions['board'] = sublime.Region(
+            template.cells[0].begin(), template.cells[-1].end())
+        begin = template.add('\n') + 1
+        template.add(' - | ? | + ')
+        template.regions['zoom_out'] = sublime.Region(begin, begin + 3)
+        template.regions['hint'] = sublime.Region(begin + 4, begin + 7)
+        template.regions['zoom_in'] = sublime.Region(begin + 8, begin + 11)
+        return template
+
+    @timed('draw_board')
+    def draw_board(self):
+        self.loaded = False
+        template = self.template(3, 3, 11)
+        self.cell_regions = template.cells
+        self.layout = template.layout
+        handler_regions = []
+        handlers = []
+        values = dict((x, MARKS[y]) for x, y in enumerate(self.board))
+        if not self.game_over:
+            values['title'] = self.centered_text(self.whos_move, 11)
+        else:
+            values['title'] = ' Game Over '
+        data = template.render(values)
+
+        if not self.game_over:
+            handler_regions.append(template.regions['board'])
+            handlers.append(self.weak_region_handler('click_region'))
+        if not self.game_over or self.winner is not None:
+            handler_regions.append(template.regions['zoom_out'])
+            handlers.append(self.weak_handler('zoom', -10, True))
+            handler_regions.append(template.regions['zoom_in'])
+            handlers.append(self.weak_handler('zoom', +10, True))
+        if not self.game_over:
+            handler_regions.append(template.regions['hint'])
+            handlers.append(self.weak_handler('show_hint'))
+        else:
+            handler_regions.append(sublime.Region(0, template.size))
+            handlers.append(self.weak_handler('reset_game'))
+
+        set_event_handlers(self.view, handler_regions, handlers)
+        self.render(data)
+        self.draw_regions({'hint': []})
+        self.loaded = True
+
+    def click_region(self, region, point):
+        index = self.layout.index(self.view, point)
+        if index is not None:
+            self.click_handler(index)
+
+    def click_handler(self, index):
+        if self.game_over or self.whos_move == self.computer or self.board[index]:
+            return
+        self.apply_move(index)
+        self.computer_move()
+        self.clear_selection()
+        self.request_draw()
+        self.persist_log()
+
+    def apply_move(self, index):
+        status = super(TicTacToeGame, self).apply_move(index)
+        if not status == STATUS_PLAYING:
+            self.set_color_scheme(background='#cccccc')
+        return status
+
+    def best_move(self):
+        return tic_tac_toe_move(self.board)
+
+    def computer_move(self):
+        if self.game_over or not self.whos_move == self.computer:
+            return
+        index = self.best_move()
+        if index is not None:
+            self.apply_move(index)
+
+    def is_computer_turn(self):
+        return self.whos_move == self.computer
+
+    def history_changed(self):
+        self.computer_move()
+        super(TicTacToeGame, self).history_changed()
+
+    def show_hint(self):
+        index = self.best_move()
+        self.clear_selection()
+        if index is not None:
+            self.draw_regions({'hint': [self.cell_regions[index]]})
+
+    @timed('is_game_over')
+    def is_game_over(self, index):
+        return super(TicTacToeGame, self).is_game_over(index)
+
+    def reset_game(self):
+        self.color_scheme_path(background='#cccccc')
+        self.set_color_scheme()
+        self.reset_state()
+        self.computer_move()
+        self.request_draw()
+        self.persist_log()
+
+    def replay(self, moves):
+        self.reset_state()
+        for index in moves:
+            if index not in self.legal_moves():
+                self.reset_state()
+                raise ValueError('Illegal move %r in game log' % index)
+            self.apply_move(index)
+        self.computer_move()
+        self.request_draw()
+        self.persist_log()
+
+    def log_params(self):
+        return (MARKS.index(self.computer) if self.computer else 0,)
+
+    @classmethod
+    def from_log(cls, view, params, moves):
+        if not len(params) == 1 or not 0 <= params[0] < len(MARKS):
+            raise ValueError('Bad Tic Tac Toe log parameters %r' % (params,))
+        game = cls(view, MARKS[params[0]].strip() or None)
+        game.replay(moves)
+        return game
@@ -0,0 +1,273 @@
+import base64
+import os.path
+import struct
+import sys
+
+import sublime
+import sublime_plugin
+
+
+if '.' in __name__:
+    from .base import COLOR_SCHEMES, LIFECYCLE, LOG_SETTING, TEMPLATES, parse_log
+    from .stats import clear_stats
+    from .touch import LiveEventListener, event_handler_usage, remove_view_events
+    from .utils import SUBLIME_MAJOR, UtilsEditViewCommand
+else:
+    from base import COLOR_SCHEMES, LIFECYCLE, LOG_SETTING, TEMPLATES, parse_log
+    from stats import clear_stats
+    from touch import LiveEventListener, event_handler_usage, remove_view_events
+    from utils import SUBLIME_MAJOR, UtilsEditViewCommand
+
+
+GAMES_PACKAGE = __name__.rpartition('.')[0]
+GAMES = {}
+GAME_LOG_IDS = {}
+LIFECYCLE.cleanups.extend([remove_view_events, clear_stats])
+
+
+def register(name, log_id, class_name, module=None):
+    GAMES[name] = {
+        'module': module or 'games.%s' % name, 'class_name': class_name,
+        'log_id': log_id, 'class': None
+    }
+    GAME_LOG_IDS[log_id] = name
+
+
+register('in_a_row', 1, 'InARowGame')
+register('tic_tac_toe', 2, 'TicTacToeGame')
+
+
+def game_class(name):
+    game = GAMES[name]
+    if game['class'] is None:
+        module = game['module']
+        if GAMES_PACKAGE:
+            module = '%s.%s' % (GAMES_PACKAGE, module)
+        __import__(module)
+        game['class'] = getattr(sys.modules[module], game['class_name'])
+    return game['class']
+
+
+def find_view(window, view_id=None):
+    if view_id is not None:
+        for view in window.views():
+            if view.id() == view_id:
+                return view
+    return window.new_file()
+
+
+def start_game(window, name, view_id=None, **kwargs):
+    LIFECYCLE.prune()
+    view = find_view(window, view_id)
+    cls = game_class(name)
+    game = LIFECYCLE.get(view)
+    if game.__class__ is cls and game.view.id() == view.id():
+        mirrors = game.mirrors
+        game.__init__(view, **kwargs)
+        for mirror in mirrors:
+            game.attach(mirror)
+        return game
+    return LIFECYCLE.add(view, cls(view, **kwargs))
+
+
+def restore_games():
+    for window in sublime.windows():
+        for view in window.views():
+            data = view.settings().get(LOG_SETTING)
+            if not data or LIFECYCLE.get(view) is not None:
+                continue
+            try:
+                game_id, params, moves = parse_log(base64.b64decode(data))
+            except (ValueError, TypeError, struct.error):
+                continue
+            if game_id not in GAME_LOG_IDS:
+                continue
+            try:
+                game = game_class(GAME_LOG_IDS[game_id]).from_log(view, params, moves)
+            except ValueError:
+                continue
+            LIFECYCLE.add(view, game)
+
+
+def plugin_loaded():
+    restore_games()
+
+
+class GamesStartCommand(sublime_plugin.WindowCommand):
+    def run(self, game, view_id=None, **kwargs):
+        start_game(self.window, game, view_id, **kwargs)
+
+
+class InARowStartCommand(sublime_plugin.WindowCommand):
+    def run(self, **kwargs):
+        start_game(self.window, 'in_a_row', **kwargs)
+
+
+class InARowPromptCommand(sublime_plugin.WindowCommand):
+    def run(self, rows=6, cols=7, target=4, players=2, computers=0, think_time=1.0, view_id=None):
+        self.view_id = view_id
+        self.think_time = think_time
+        initial = '%s-%s-%s-%s-%s' % (rows, cols, target, players, computers)
+        self.window.show_input_panel(
+            'rows-cols[-target[-players[-computers]]]', initial, self.on_done, None, None
+        )
+
+    def on_done(self, text):
+        for separator in ['-', ' ', ',', '\t', ':']:
+            bits = text.split(separator)
+            if 2 <= len(bits) < 5:
+                bits.extend(['4', '2', '0'][len(bits) - 2:])
+            if len(bits) == 5 and len([x for x in bits if x.isdigit()]) == 5:
+                rows, cols, target, players, computers = [int(x) for x in bits]
+                self.window.run_command(
+                    'games_start',
+                    {
+                        'game': 'in_a_row', 'rows': rows, 'cols': cols, 'target': target,
+                        'players': players, 'computers': computers,
+                        'think_time': self.think_time, 'view_id': self.view_id
+                    }
+                )
+                break
+
+
+class InARowScrollCommand(sublime_plugin.TextCommand):
+    def run(self, edit, rows=0, cols=0):
+        game = LIFECYCLE.get(self.view)
+        if game is not None and hasattr(game, 'scroll'):
+            game.scroll(rows, cols)
+
+
+class InARowToggleThreatsCommand(sublime_plugin.TextCommand):
+    def run(self, edit, enabled=None):
+        game = LIFECYCLE.get(self.view)
+        if game is not None and hasattr(game, 'toggle_threats'):
+            game.toggle_threats(enabled)
+
+
+class InARowHintCommand(sublime_plugin.TextCommand):
+    def run(self, edit):
+        game = LIFECYCLE.get(self.view)
+        if game is not None and hasattr(game, 'book_move'):
+            game.show_hint()
+
+
+class TicTacToeStartCommand(sublime_plugin.WindowCommand):
+    def run(self, **kwargs):
+        start_game(self.window, 'tic_tac_toe', **kwargs)
+
+
+class GamesMirrorCommand(sublime_plugin.WindowCommand):
+    def run(self, new_window=True):
+        view = self.window.active_view()
+        game = LIFECYCLE.get(view) if view is not None else None
+        if game is None:
+            sublime.message_dialog('The active view is not a game.')
+            return
+        window = self.window
+        if new_window:
+            sublime.run_command('new_window')
+            window = sublime.active_window()
+        mirror = window.new_file()
+        game.attach(mirror)
+        LIFECYCLE.add(mirror, game)
+
+
+class GamesUndoCommand(sublime_plugin.TextCommand):
+    def run(self, edit):
+        game = LIFECYCLE.get(self.view)
+        if game is not None:
+            game.undo()
+
+
+class GamesRedoCommand(sublime_plugin.TextCommand):
+    def run(self, edit):
+        game = LIFECYCLE.get(self.view)
+        if game is not None:
+            game.redo()
+
+
+class GamesSaveLogCommand(sublime_plugin.WindowCommand):
+    def run(self, path=None):
+        view = self.window.active_view()
+        game = LIFECYCLE.get(view) if view is not None else None
+        if game is None:
+            sublime.message_dialog('The active view is not a game.')
+            return
+        if path is None:
+            path = os.path.join(
+                sublime.packages_path(), 'User', '%s.gamelog' % view.name().replace(' ', '_'))
+            self.window.show_input_panel(
+                'Save game log:', path, lambda x: self.run(x), None, None)
+            return
+        with open(os.path.expanduser(path), 'wb') as log_file:
+            log_file.write(game.dump_log())
+
+
+class GamesLoadLogCommand(sublime_plugin.WindowCommand):
+    def run(self, path=None):
+        if path is None:
+            path = os.path.join(sublime.packages_path(), 'User', '')
+            self.window.show_input_panel(
+                'Load game log:', path, lambda x: self.run(x), None, None)
+            return
+        try:
+            with open(os.path.expanduser(path), 'rb') as log_file:
+                game_id, params, moves = parse_log(log_file.read())
+        except (IOError, ValueError, struct.error):
+            sublime.message_dialog('Could not read a game log from %s' % path)
+            return
+        if game_id not in GAME_LOG_IDS:
+            sublime.message_dialog('Unknown game in %s' % path)
+            return
+        view = self.window.new_file()
+        try:
+            game = game_class(GAME_LOG_IDS[game_id]).from_log(view, params, moves)
+        except ValueError as error:
+            self.window.focus_view(view)
+            self.window.run_command('close_file')
+            sublime.message_dialog('Could not replay %s: %s' % (path, error))
+            return
+        LIFECYCLE.add(view, game)
+
+
+def format_memory(views):
+    names = dict((x.id(), x.name()) for x in views)
+    lines = ['%-8s %-16s %-16s %9s %12s %12s' % (
+        'View', 'Name', 'Game', 'Handlers', 'Game KB', 'Handler KB')]
+    totals = [0, 0, 0]
+    for view_id in sorted(LIFECYCLE.games):
+        game = LIFECYCLE.games[view_id]
+        handlers, handler_size = event_handler_usage(view_id)
+        game_size = game.memory_usage()
+        totals = [totals[0] + handlers, totals[1] + game_size, totals[2] + handler_size]
+        lines.append('%-8s %-16s %-16s %9d %12.1f %12.1f' % (
+            view_id, names.get(view_id, 'closed')[:16], game.__class__.__name__[:16],
+            handlers, game_size / 1024.0, handler_size / 1024.0))
+    lines.append('%-8s %-16s %-16s %9d %12.1f %12.1f' % (
+        'Total', '', '%d games' % len(LIFECYCLE.games),
+        totals[0], totals[1] / 1024.0, totals[2] / 1024.0))
+    lines.append('Cached templates: %d  Color schemes: %d' % (len(TEMPLATES), len(COLOR_SCHEMES)))
+    return '\n'.join(lines) + '\n'
+
+
+class GamesShowMemoryCommand(sublime_plugin.WindowCommand):
+    def run(self):
+        LIFECYCLE.prune()
+        views = [x for window in sublime.windows() for x in window.views()]
+        if SUBLIME_MAJOR == 3:
+            panel = self.window.create_output_panel('games_memory')
+        else:
+            panel = self.window.get_output_panel('games_memory')
+        panel.run_command('utils_edit_view', {
+            'data': format_memory(views), 'start': 0, 'end': panel.size()
+        })
+        self.window.run_command('show_panel', {'panel': 'output.games_memory'})
+
+
+class GamesListener(sublime_plugin.EventListener):
+    def on_close(self, view):
+        LIFECYCLE.close(view.id())
+
+
+if SUBLIME_MAJOR == 2:
+    sublime.set_timeout(plugin_loaded, 0)
@@ -0,0 +1,122 @@
+from array import array
+import functools
+import time
+
+import sublime
+import sublime_plugin
+
+
+if '.' in __name__:
+    from .touch import TOUCH_EVENT_HOOKS
+    from .utils import SUBLIME_MAJOR
+else:
+    from touch import TOUCH_EVENT_HOOKS
+    from utils import SUBLIME_MAJOR
+
+
+STATS_ENABLED = False
+STATS = {}
+STATS_SIZE = 512
+STATS_COUNTS = ('touch.handlers', 'region_layers.changed')
+TIMER = getattr(time, 'perf_counter', time.time)
+
+
+class RollingHistogram(object):
+    def __init__(self, size=STATS_SIZE):
+        self.values = array('d', [0.0]) * size
+        self.count = 0
+        self.maximum = 0.0
+
+    def add(self, value):
+        self.values[self.count % len(self.values)] = value
+        self.count += 1
+        if value > self.maximum:
+            self.maximum = value
+
+    def percentile(self, percent):
+        values = sorted(self.values[:min(self.count, len(self.values))])
+        if not values:
+            return 0.0
+        return values[min(len(values) - 1, int(len(values) * percent / 100.0))]
+
+
+def record(view, name, value):
+    if not STATS_ENABLED or view is None:
+        return
+    view_stats = STATS.setdefault(view.id(), {})
+    if name not in view_stats:
+        view_stats[name] = RollingHistogram()
+    view_stats[name].add(value)
+
+
+def timed(name):
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            if not STATS_ENABLED:
+                return method(self, *args, **kwargs)
+            started = TIMER()
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                record(self.view, name, TIMER() - started)
+        return wrapper
+    return decorator
+
+
+def clear_stats(view_id):
+    STATS.pop(view_id, None)
+
+
+def record_touch_event(view, seconds, scanned):
+    record(view, 'touch.event_handler', seconds)
+    record(view, 'touch.handlers', scanned)
+
+
+def enable_stats(enabled=True):
+    global STATS_ENABLED
+    STATS_ENABLED = enabled
+    if enabled and record_touch_event not in TOUCH_EVENT_HOOKS:
+        TOUCH_EVENT_HOOKS.append(record_touch_event)
+    elif not enabled and record_touch_event in TOUCH_EVENT_HOOKS:
+        TOUCH_EVENT_HOOKS.remove(record_touch_event)
+
+
+def format_stats(views=None):
+    names = dict((x.id(), x.name()) for x in (views or []))
+    lines = []
+    for view_id in sorted(STATS.keys()):
+        lines.append('View %s (%s)' % (view_id, names.get(view_id, 'closed')))
+        for name, histogram in sorted(STATS[view_id].items()):
+            if name in STATS_COUNTS:
+                scale, unit = 1, ''
+            else:
+                scale, unit = 1000, 'ms'
+            lines.append('  %-22s n=%-7d p50=%9.3f%s p95=%9.3f%s max=%9.3f%s' % (
+                name, histogram.count,
+                histogram.percentile(50) * scale, unit,
+                histogram.percentile(95) * scale, unit,
+                histogram.maximum * scale, unit
+            ))
+    if not lines:
+        lines.append('No stats recorded. Stats are %s.' % ('on' if STATS_ENABLED else 'off'))
+    return '\n'.join(lines) + '\n'
+
+
+class GamesShowStatsCommand(sublime_plugin.WindowCommand):
+    def run(self):
+        views = [x for window in sublime.windows() for x in window.views()]
+        if SUBLIME_MAJOR == 3:
+            panel = self.window.create_output_panel('games_stats')
+        else:
+            panel = self.window.get_output_panel('games_stats')
+        panel.run_command('utils_edit_view', {
+            'data': format_stats(views), 'start': 0, 'end': panel.size()
+        })
+        self.window.run_command('show_panel', {'panel': 'output.games_stats'})
+
+
+class GamesToggleStatsCommand(sublime_plugin.WindowCommand):
+    def run(self, enabled=None):
+        enable_stats(not STATS_ENABLED if enabled is None else enabled)
+        sublime.status_message('Games stats %s' % ('on' if STATS_ENABLED else 'off'))
@@ -1,19 +1,36 @@
 
+import bisect
+import itertools
+import sys
+import threading
 import time
-import uuid
+import traceback
 
+import sublime
 import sublime_plugin
 
 
-TOUCH_EVENT_TIME = None
+TOUCH_EVENT_THROTTLE = 0.2
+TOUCH_EVENT_THROTTLES = {}
+TOUCH_EVENT_TIMES = {}
 TOUCH_EVENT_HANDLERS = {}
 TOUCH_EVENT_HANDLERS_ASYNC = {}
+TOUCH_EVENT_INDEXES = {}
+TOUCH_EVENT_IDS = itertools.count(1)
+TOUCH_EVENT_QUEUE = []
+TOUCH_EVENT_PENDING = {}
+TOUCH_EVENT_CONDITION = threading.Condition()
+TOUCH_EVENT_WORKER = None
+TOUCH_EVENT_HOOKS = []
+TOUCH_EVENT_LINKS = {}
+TOUCH_EVENT_TIMER = getattr(time, 'perf_counter', time.time)
 
 
 def add_event_handler(view, region, handler=None, handler_id=None, HANDLERS=TOUCH_EVENT_HANDLERS):
     if handler_id is None:
-        handler_id = uuid.uuid4()
+        handler_id = next(TOUCH_EVENT_IDS)
     HANDLERS.setdefault(view.id(), {})[handler_id] = [region, handler]
+    invalidate_event_index(view, HANDLERS)
     return handler_id
 
 
@@ -23,10 +40,15 @@ def add_event_handler_async(view, region, handler, handler_id=None):
 
 def add_event_handlers(view, regions, handlers, handler_ids=None, HANDLERS=TOUCH_EVENT_HANDLERS):
     handler_ids = [] if handler_ids is None else handler_ids
-    for i in range(regions):
+    for i in range(len(regions)):
         if len(handler_ids) == i:
             handler_ids.append(None)
-        handler_ids[i] = add_event_handler(view, regions[i], handlers[i], handler_ids[i], HANDLERS)
+        if handler_ids[i] is None:
+            handler_ids[i] = next(TOUCH_EVENT_IDS)
+    HANDLERS.setdefault(view.id(), {}).update(
+        zip(handler_ids, [[x, y] for x, y in zip(regions, handlers)])
+    )
+    invalidate_event_index(view, HANDLERS)
     return handler_ids
 
 
@@ -34,9 +56,21 @@ def add_event_handlers_async(view, regions, handlers, handler_ids=None):
     return add_event_handlers(view, regions, handlers, handler_ids, TOUCH_EVENT_HANDLERS_ASYNC)
 
 
+def set_event_handlers(view, regions, handlers, HANDLERS=TOUCH_EVENT_HANDLERS):
+    handler_ids = [next(TOUCH_EVENT_IDS) for x in regions]
+    HANDLERS[view.id()] = dict(zip(handler_ids, [[x, y] for x, y in zip(regions, handlers)]))
+    invalidate_event_index(view, HANDLERS)
+    return handler_ids
+
+
+def set_event_handlers_async(view, regions, handlers):
+    return set_event_handlers(view, regions, handlers, TOUCH_EVENT_HANDLERS_ASYNC)
+
+
 def remove_event_handler(view, handler_id, HANDLERS=TOUCH_EVENT_HANDLERS):
     if view.id() in HANDLERS and handler_id in HANDLERS[view.id()]:
         del HANDLERS[view.id()][handler_id]
+        invalidate_event_index(view, HANDLERS)
         return handler_id
 
 
@@ -48,6 +82,7 @@ def remove_event_handlers(view, HANDLERS=TOUCH_EVENT_HANDLERS):
     if view.id() in HANDLERS:
         handler_ids = HANDLERS[view.id()].keys()
         del HANDLERS[view.id()]
+        invalidate_event_index(view, HANDLERS)
         return handler_ids
 
 
@@ -55,35 +90,178 @@ def remove_event_handlers_async(view):
     return remove_event_handlers(view, TOUCH_EVENT_HANDLERS_ASYNC)
 
 
-def event_handler(view, HANDLERS=TOUCH_EVENT_HANDLERS):
-    global TOUCH_EVENT_TIME
-    if not view.id() in HANDLERS:
+def link_view(view, source_view):
+    TOUCH_EVENT_LINKS[view.id()] = source_view.id()
+
+
+def unlink_view(view_id):
+    TOUCH_EVENT_LINKS.pop(view_id, None)
+
+
+def event_view_id(view):
+    return TOUCH_EVENT_LINKS.get(view.id(), view.id())
+
+
+def run_async(callback):
+    if hasattr(sublime, 'set_timeout_async'):
+        sublime.set_timeout_async(callback, 0)
+    else:
+        thread = threading.Thread(target=callback)
+        thread.daemon = True
+        thread.start()
+
+
+def build_event_index(view_handlers):
+    opening = {}
+    closing = {}
+    entries = list(view_handlers.items())
+    for position, entry in enumerate(entries):
+        region = entry[1][0]
+        opening.setdefault(region.begin(), []).append(position)
+        closing.setdefault(region.end(), []).append(position)
+    bounds = sorted(set(opening) | set(closing))
+    at_bound = []
+    after_bound = []
+    active = set()
+    for bound in bounds:
+        active.update(opening.get(bound, ()))
+        at_bound.append([entries[x] for x in sorted(active)])
+        active.difference_update(closing.get(bound, ()))
+        after_bound.append([entries[x] for x in sorted(active)])
+    return bounds, at_bound, after_bound
+
+
+def find_event_handlers(view, point, HANDLERS=TOUCH_EVENT_HANDLERS):
+    view_id = event_view_id(view)
+    key = (id(HANDLERS), view_id)
+    index = TOUCH_EVENT_INDEXES.get(key)
+    if index is None:
+        index = TOUCH_EVENT_INDEXES[key] = build_event_index(HANDLERS.get(view_id, {}))
+    bounds, at_bound, after_bound = index
+    position = bisect.bisect_right(bounds, point) - 1
+    if position < 0:
+        return []
+    if bounds[position] == point:
+        return at_bound[position]
+    return after_bound[position]
+
+
+def invalidate_event_index(view, HANDLERS=TOUCH_EVENT_HANDLERS):
+    TOUCH_EVENT_INDEXES.pop((id(HANDLERS), view.id()), None)
+
+
+def set_event_throttle(view, seconds=None):
+    if seconds is None:
+        TOUCH_EVENT_THROTTLES.pop(view.id(), None)
+    else:
+        TOUCH_EVENT_THROTTLES[view.id()] = seconds
+
+
+def event_point(view, HANDLERS=TOUCH_EVENT_HANDLERS):
+    if not event_view_id(view) in HANDLERS:
         return None
 
     regions = view.sel()
+    if not (len(regions) == 1 and regions[0].empty()):
+        return None
+
     event_time = time.time()
+    key = (id(HANDLERS), view.id())
+    last_time = TOUCH_EVENT_TIMES.get(key)
+    throttle = TOUCH_EVENT_THROTTLES.get(view.id(), TOUCH_EVENT_THROTTLE)
+    if last_time is not None and last_time >= event_time - throttle:
+        return None
+    TOUCH_EVENT_TIMES[key] = event_time
+    return regions[0].begin()
 
-    if len(regions) == 1 and regions[0].empty() and (
-        TOUCH_EVENT_TIME is None or
-        TOUCH_EVENT_TIME < event_time - 0.2
-    ):
-        point = regions[0].begin()
-        TOUCH_EVENT_TIME = event_time
 
-        view_handler_items = list(HANDLERS[view.id()].items())
-        for handler_id, region_handler in view_handler_items:
-            region, handler = region_handler
-            if region.contains(point):
-                handler(handler_id, view, region, point)
+def dispatch_event(view, point, HANDLERS=TOUCH_EVENT_HANDLERS, view_handler_items=None):
+    if TOUCH_EVENT_HOOKS:
+        started = TOUCH_EVENT_TIMER()
+    if view_handler_items is None:
+        view_handler_items = find_event_handlers(view, point, HANDLERS)
+    for handler_id, region_handler in view_handler_items:
+        region, handler = region_handler
+        handler(handler_id, view, region, point)
+    if TOUCH_EVENT_HOOKS:
+        elapsed = TOUCH_EVENT_TIMER() - started
+        for hook in list(TOUCH_EVENT_HOOKS):
+            hook(view, elapsed, len(view_handler_items))
+
+
+def event_handler(view, HANDLERS=TOUCH_EVENT_HANDLERS):
+    point = event_point(view, HANDLERS)
+    if point is not None:
+        dispatch_event(view, point, HANDLERS)
+
+
+def queue_event(view, HANDLERS=TOUCH_EVENT_HANDLERS_ASYNC):
+    global TOUCH_EVENT_WORKER
+    point = event_point(view, HANDLERS)
+    if point is None:
+        return None
+
+    key = (id(HANDLERS), view.id())
+    view_handler_items = find_event_handlers(view, point, HANDLERS)
+    with TOUCH_EVENT_CONDITION:
+        if key in TOUCH_EVENT_PENDING:
+            TOUCH_EVENT_PENDING[key][1:3] = [point, view_handler_items]
+        else:
+            TOUCH_EVENT_PENDING[key] = [view, point, view_handler_items, HANDLERS]
+            TOUCH_EVENT_QUEUE.append(key)
+        if TOUCH_EVENT_WORKER is None:
+            TOUCH_EVENT_WORKER = threading.Thread(target=dispatch_queued_events)
+            TOUCH_EVENT_WORKER.daemon = True
+            TOUCH_EVENT_WORKER.start()
+        TOUCH_EVENT_CONDITION.notify()
+    return point
+
+
+def dispatch_queued_events():
+    while True:
+        with TOUCH_EVENT_CONDITION:
+            while not TOUCH_EVENT_QUEUE:
+                TOUCH_EVENT_CONDITION.wait()
+            view, point, view_handler_items, HANDLERS = TOUCH_EVENT_PENDING.pop(
+                TOUCH_EVENT_QUEUE.pop(0))
+        try:
+            dispatch_event(view, point, HANDLERS, view_handler_items)
+        except Exception:
+            traceback.print_exc()
+
+
+def remove_view_events(view_id):
+    for HANDLERS in (TOUCH_EVENT_HANDLERS, TOUCH_EVENT_HANDLERS_ASYNC):
+        key = (id(HANDLERS), view_id)
+        HANDLERS.pop(view_id, None)
+        TOUCH_EVENT_INDEXES.pop(key, None)
+        TOUCH_EVENT_TIMES.pop(key, None)
+        with TOUCH_EVENT_CONDITION:
+            if TOUCH_EVENT_PENDING.pop(key, None) is not None:
+                TOUCH_EVENT_QUEUE.remove(key)
+    TOUCH_EVENT_THROTTLES.pop(view_id, None)
+    TOUCH_EVENT_LINKS.pop(view_id, None)
+
+
+def event_handler_usage(view_id):
+    count = size = 0
+    for HANDLERS in (TOUCH_EVENT_HANDLERS, TOUCH_EVENT_HANDLERS_ASYNC):
+        view_handlers = HANDLERS.get(view_id, {})
+        count += len(view_handlers)
+        size += sys.getsizeof(view_handlers)
+        for entry in view_handlers.values():
+            size += sys.getsizeof(entry) + sys.getsizeof(entry[0])
+        index = TOUCH_EVENT_INDEXES.get((id(HANDLERS), view_id))
+        if index is not None:
+            size += sum(sys.getsizeof(x) for x in index)
+            size += sum(sys.getsizeof(x) for x in index[1] + index[2])
+    return count, size
 
 
 class LiveEventListener(sublime_plugin.EventListener):
     def on_selection_modified(self, view):
         event_handler(view)
-
-    def on_selection_modified_async(self, view):
-        event_handler(view, TOUCH_EVENT_HANDLERS_ASYNC)
+        queue_event(view)
 
     def on_close(self, view):
-        remove_event_handlers(view)
-        remove_event_handlers_async(view)
+        remove_view_events(view.id())
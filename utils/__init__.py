@@ -3,8 +3,23 @@ import sublime
 import sublime_plugin
 
 
+SUBLIME_MAJOR = int(sublime.version()[0])
+
+if SUBLIME_MAJOR not in (2, 3):
+    raise Exception('We only support sublime 2 or 3')
+
+
 class UtilsEditViewCommand(sublime_plugin.TextCommand):
-    def run(self, edit, data=None, start=0, end=None):
+    def run(self, edit, data=None, start=0, end=None, edits=None):
+        if edits is not None:
+            was_read_only = self.view.is_read_only()
+            if was_read_only:
+                self.view.set_read_only(False)
+            for start, end, data in sorted(edits, key=lambda x: -int(x[0])):
+                self.view.replace(edit, sublime.Region(int(start), int(end)), data)
+            if was_read_only:
+                self.view.set_read_only(True)
+            return
         start = int(start)
         if end is not None:
             end = int(end)